@@ -0,0 +1,73 @@
+import json
+
+from django.http import JsonResponse
+from django.utils.translation import gettext as _
+
+from frontend.models import Game, Guess, Language
+from function.candidate_solver import get_candidate_solver
+from function.champion_matrix import compare_champions, get_champion_matrix
+from function.translation_catalog import get_translation_catalog
+
+
+def remaining_champions(request):
+    """API endpoint to list the champions still consistent with a game's guesses.
+
+    GET takes a game_id and replays its guesses; POST takes
+    {"guesses": [{"champion_id": ..., "feedback": {...}, "is_correct": false}]}
+    for analytics on arbitrary guess sequences.
+    """
+    if request.method == 'GET':
+        game_id = request.GET.get('game_id')
+        if not game_id or not game_id.isdigit():
+            return JsonResponse({'error': _('Missing game_id parameter')}, status=400)
+
+        game = Game.objects.filter(id=game_id, game_type='champion').first()
+        if not game:
+            return JsonResponse({'error': _('Game not found')}, status=404)
+
+        matrix = get_champion_matrix()
+        target = matrix.get(game.target_champion_id)
+        if target is None:
+            return JsonResponse({'error': _('Game has no target champion')}, status=400)
+
+        guesses = []
+        guessed_ids = Guess.objects.filter(
+            game_id=game.id,
+            champion_id__isnull=False
+        ).order_by('guess_number').values_list('champion_id', flat=True)
+        for champion_id in guessed_ids:
+            guessed = matrix.get(champion_id)
+            if guessed is not None:
+                guesses.append((champion_id, compare_champions(target, guessed), champion_id == target.id))
+
+    elif request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            guesses = [
+                (int(guess['champion_id']), guess.get('feedback') or {}, bool(guess.get('is_correct')))
+                for guess in data.get('guesses', [])
+            ]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return JsonResponse({'error': _('Missing parameters')}, status=400)
+
+    else:
+        return JsonResponse({'error': _('Invalid request method')}, status=400)
+
+    champion_ids = get_candidate_solver().remaining(guesses)
+
+    # Get language for translations
+    language = Language.objects.filter(code=request.LANGUAGE_CODE).first()
+    catalog = get_translation_catalog()
+    matrix = get_champion_matrix()
+
+    return JsonResponse({
+        'count': len(champion_ids),
+        'champions': [
+            {
+                'id': champion_id,
+                'name': catalog.name('champion', champion_id, language),
+                'image': matrix.get(champion_id).image_main
+            }
+            for champion_id in champion_ids
+        ]
+    })
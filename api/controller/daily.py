@@ -0,0 +1,136 @@
+import json
+from datetime import date
+
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils.translation import gettext as _
+
+from frontend.models import GameMode, Language
+from api.controller.games import count_completed_game, get_current_user, persist_completed_game
+from function.champion_matrix import get_champion_matrix
+from function.daily_challenge import (
+    get_daily_target, get_daily_target_details, has_played_daily, start_daily_state, utc_today
+)
+from function.general import prepare_guess_feedback
+from function.scoring import calculate_score
+
+
+def new_daily_game(request):
+    """AJAX endpoint to start (or resume) today's daily challenge"""
+    if request.method == 'POST':
+        difficulty = request.POST.get('difficulty', 'medium')
+
+        # Get game mode
+        game_mode = GameMode.objects.filter(name__iexact=difficulty).first()
+        if not game_mode:
+            return JsonResponse({'error': _('Invalid difficulty')}, status=400)
+
+        day = utc_today()
+        target_champion_id = get_daily_target(day)
+        if target_champion_id is None:
+            return JsonResponse({'error': _('No champions available')}, status=500)
+
+        # No Game row yet: the state lives in the session until the game is completed
+        state = start_daily_state(request.session, game_mode, day)
+
+        # The session only knows its own game; the player may have finished today's in another one
+        if not state['is_completed'] and has_played_daily(get_current_user(request), day):
+            return JsonResponse({'error': _("You have already played today's daily challenge")}, status=400)
+
+        language = Language.objects.filter(code=request.LANGUAGE_CODE).first()
+
+        return JsonResponse({
+            'date': state['date'],
+            'max_attempts': state['max_attempts'],
+            'attempts_used': len(state['guesses']),
+            'game_completed': state['is_completed'],
+            'previous_guesses': [
+                prepare_guess_feedback(target_champion_id, champion_id, language)
+                for champion_id in state['guesses']
+            ]
+        })
+
+    return JsonResponse({'error': _('Invalid request')}, status=400)
+
+
+def make_daily_guess(request):
+    """AJAX endpoint to submit a guess for today's daily challenge"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            champion_id = data.get('champion_id')
+
+            if not champion_id:
+                return JsonResponse({'error': _('Missing parameters')}, status=400)
+
+            # A game started just before midnight UTC keeps the target of the day it was started
+            state = request.session.get('daily_game')
+            if not state:
+                return JsonResponse({'error': _('Game not found')}, status=404)
+            day = date.fromisoformat(state['date'])
+
+            if state['is_completed']:
+                return JsonResponse({'error': _('Game already completed')}, status=400)
+
+            # Get the guessed champion
+            guessed_champion = get_champion_matrix().get(champion_id)
+            if guessed_champion is None:
+                return JsonResponse({'error': _('Champion not found')}, status=404)
+
+            if guessed_champion.id in state['guesses']:
+                return JsonResponse({
+                    'error': _('You have already guessed this champion')
+                }, status=400)
+
+            target_champion_id = get_daily_target(day)
+            state['guesses'].append(guessed_champion.id)
+            attempts_used = len(state['guesses'])
+            is_correct = target_champion_id == guessed_champion.id
+
+            score = 0
+            user_name = None
+            if is_correct or attempts_used >= state['max_attempts']:
+                state['is_completed'] = True
+                state['is_won'] = is_correct
+                game_mode = GameMode.objects.get(id=state['game_mode_id'])
+                score = calculate_score(game_mode, attempts_used, is_correct)
+                try:
+                    # The unique (user, daily_date) key keeps one game per player and day,
+                    # also when two sessions finish at the same time
+                    game, user_name = persist_completed_game(
+                        request, 'daily', game_mode.id, target_champion_id, state['guesses'], is_correct, score,
+                        daily_date=day
+                    )
+                except IntegrityError:
+                    request.session['daily_game'] = state
+                    request.session.modified = True
+                    return JsonResponse({'error': _("You have already played today's daily challenge")}, status=400)
+
+                # Kullanıcı istatistiklerini güncelle
+                count_completed_game(request, game)
+
+            request.session['daily_game'] = state
+            request.session.modified = True
+
+            # Get language for translations
+            language = Language.objects.filter(code=request.LANGUAGE_CODE).first()
+
+            response_data = {
+                'is_correct': is_correct,
+                'game_completed': state['is_completed'],
+                'attempts_used': attempts_used,
+                'max_attempts': state['max_attempts'],
+                'feedback': prepare_guess_feedback(target_champion_id, guessed_champion.id, language),
+                'score': score,
+                'user': user_name or _('Anonymous')
+            }
+
+            # If game completed, add target champion details
+            if state['is_completed']:
+                response_data['target_champion'] = get_daily_target_details(language, day)
+
+            return JsonResponse(response_data)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+    return JsonResponse({'error': _('Invalid request method')}, status=400)
@@ -1,10 +1,53 @@
+from django.db.models import OuterRef, Subquery
 from django.http import JsonResponse
 
 # Change this import to use frontend.models instead of lolgame.models
 from frontend.models import Game, Language, Guess, User, UserStat
+from function.champion_matrix import get_champion_matrix
 from function.general import get_champion_details
+from function.pagination import keyset_page
 from django.utils.translation import gettext as _
 
+
+def serialize_games(games, language):
+    """History rows of a page of games loaded with select_related and last_guess_champion_id; runs no queries"""
+    matrix = get_champion_matrix()
+    details = {}
+
+    games_data = []
+    for game in games:
+        # Get the target champion details, once per champion on the page
+        target_champion = None
+        if game.target_champion:
+            if game.target_champion_id not in details:
+                details[game.target_champion_id] = get_champion_details(game.target_champion, language)
+            target_champion = details[game.target_champion_id]
+
+        # Get the last guess (for lost games)
+        last_guess = None
+        if not game.is_won:
+            last_guess_row = matrix.get(game.last_guess_champion_id) if game.last_guess_champion_id else None
+            if last_guess_row:
+                last_guess = {
+                    'name': last_guess_row.name,
+                    'image': last_guess_row.image_main
+                }
+
+        # Add game details to response
+        games_data.append({
+            'id': game.id,
+            'target_champion': target_champion,
+            'last_guess': last_guess,
+            'is_won': game.is_won,
+            'attempts_used': game.attempts_used,
+            'max_attempts': game.game_mode.max_attempts,
+            'difficulty': game.game_mode.name,
+            'score': game.score,
+            'created_at': game.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return games_data
+
+
 def game_history(request):
     """API endpoint to get user's game history with pagination"""
     if request.method == 'GET':
@@ -23,83 +66,34 @@ def game_history(request):
             return JsonResponse({'games': [], 'has_more': False})
 
         # Get pagination parameters
-        page = int(request.GET.get('page', 1))
-        page_size = int(request.GET.get('page_size', 10))
+        cursor = request.GET.get('cursor')
+        page_size = max(1, int(request.GET.get('page_size', 10)))
         game_type = request.GET.get('game_type', 'champion')
 
-        # Calculate offset
-        offset = (page - 1) * page_size
-
-        # Get games for current user
+        # Get games for current user, with the last guess of each game in the same query
         games = Game.objects.filter(
             user=current_user,
             game_type=game_type,
             is_completed=True
-        ).order_by('-created_at')[offset:offset + page_size + 1]  # Get one extra to check if there are more
+        ).select_related('game_mode', 'target_champion').annotate(
+            last_guess_champion_id=Subquery(
+                Guess.objects.filter(game=OuterRef('pk')).order_by('-guess_number').values('champion_id')[:1]
+            )
+        )
 
-        # Check if there are more results
-        has_more = len(games) > page_size
-        if has_more:
-            games = games[:page_size]  # Remove the extra item
+        # Newest first, continuing after the cursor of the previous page
+        games, next_cursor = keyset_page(games, ('-created_at', '-id'), cursor, page_size)
 
         # Get language for translations
         language_code = request.LANGUAGE_CODE
         language = Language.objects.filter(code=language_code).first()
 
-        # Prepare response data
-        games_data = []
-        for game in games:
-            # Get the target champion details
-            target_champion = get_champion_details(game.target_champion, language) if game.target_champion else None
-
-            # Get the last guess (for lost games)
-            last_guess = None
-            if not game.is_won:
-                last_guess_obj = Guess.objects.filter(game=game).order_by('-guess_number').first()
-                if last_guess_obj and last_guess_obj.champion:
-                    last_guess = {
-                        'name': last_guess_obj.champion.name,
-                        'image': last_guess_obj.champion.image_main
-                    }
-
-            # Calculate score (for display only if not stored)
-            score = 0
-            if game.is_won:
-                # Recalculate score based on game mode and attempts
-                if game.game_mode.name.lower() == 'easy':
-                    max_score = 20
-                elif game.game_mode.name.lower() == 'medium':
-                    max_score = 28
-                elif game.game_mode.name.lower() == 'hard':
-                    max_score = 36
-                else:
-                    max_score = 36
-
-                # Calculate score based on attempts used
-                remaining_percentage = (
-                                                   game.game_mode.max_attempts - game.attempts_used + 1) / game.game_mode.max_attempts
-                score = int(max_score * remaining_percentage)
-
-                # Ensure first guess gets full max score
-                if game.attempts_used == 1:
-                    score = max_score
-
-            # Add game details to response
-            games_data.append({
-                'id': game.id,
-                'target_champion': target_champion,
-                'last_guess': last_guess,
-                'is_won': game.is_won,
-                'attempts_used': game.attempts_used,
-                'max_attempts': game.game_mode.max_attempts,
-                'difficulty': game.game_mode.name,
-                'score': score,
-                'created_at': game.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            })
+        games_data = serialize_games(games, language)
 
         return JsonResponse({
             'games': games_data,
-            'has_more': has_more
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor
         })
 
     return JsonResponse({'error': _('Invalid request method')}, status=400)
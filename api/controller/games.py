@@ -1,9 +1,13 @@
+from django.conf import settings
+from django.db import transaction
 from django.http import JsonResponse
-import random
 import uuid
 
 # Change this import to use frontend.models instead of lolgame.models
-from frontend.models import GameMode, Champion, Game, User, Ability
+from frontend.models import GameMode, Game, User, Guess
+from function.game_token import issue_game_token
+from function.target_sampler import get_target_sampler, recent_targets, remember_target
+from function.user_stats import record_completion
 from django.utils.translation import gettext as _
 
 def new_game(request):
@@ -16,12 +20,23 @@ def new_game(request):
         if not game_mode:
             return JsonResponse({'error': _('Invalid difficulty')}, status=400)
 
-        # Choose a random champion
-        champions = Champion.objects.all()
-        if not champions.exists():
+        # Choose a random champion the player has not had recently
+        target_champion_id = get_target_sampler().champion(
+            exclude=recent_targets(request.session, 'champion'),
+            game_mode=game_mode
+        )
+        if target_champion_id is None:
             return JsonResponse({'error': _('No champions available')}, status=500)
 
-        target_champion = random.choice(list(champions))
+        # Stateless games are handed to the client as a signed token, nothing is written yet
+        stateless = request.POST.get('stateless', str(settings.STATELESS_GAMES)).lower() == 'true'
+        if stateless:
+            remember_target(request.session, 'champion', target_champion_id)
+            return JsonResponse({
+                'game_token': issue_game_token(target_champion_id, game_mode.id),
+                'max_attempts': game_mode.max_attempts,
+                'user': current_user_name(request)
+            })
 
         # Get session or create new one
         session_id = request.session.get('session_id')
@@ -51,13 +66,14 @@ def new_game(request):
             session_id=session_id,
             game_mode=game_mode,
             game_type='champion',
-            target_champion=target_champion,
+            target_champion_id=target_champion_id,
             is_completed=False,
             user=current_user  # Associate the game with the user
         )
 
         # Store game ID in session
         request.session['game_id'] = game.id
+        remember_target(request.session, 'champion', target_champion_id)
         request.session.modified = True  # Force session save
 
         return JsonResponse({
@@ -79,13 +95,11 @@ def new_ability_game(request):
         if not game_mode:
             return JsonResponse({'error': _('Invalid difficulty')}, status=400)
 
-        # Choose a random ability
-        abilities = Ability.objects.all()
-        if not abilities.exists():
+        # Choose a random ability the player has not had recently
+        target_ability = get_target_sampler().ability(exclude=recent_targets(request.session, 'ability'))
+        if target_ability is None:
             return JsonResponse({'error': _('No abilities available')}, status=500)
 
-        target_ability = random.choice(list(abilities))
-
         # Get session or create new one
         session_id = request.session.get('session_id')
         if not session_id:
@@ -114,7 +128,7 @@ def new_ability_game(request):
             session_id=session_id,
             game_mode=game_mode,
             game_type='ability',
-            target_ability=target_ability,
+            target_ability_id=target_ability.id,
             is_completed=False,
             user=current_user,
             is_grey_mode=is_grey_mode
@@ -122,6 +136,7 @@ def new_ability_game(request):
 
         # Store game ID in session
         request.session['game_id'] = game.id
+        remember_target(request.session, 'ability', target_ability.id)
         request.session.modified = True
 
         return JsonResponse({
@@ -131,4 +146,84 @@ def new_ability_game(request):
             'grey_mode': is_grey_mode
         })
 
-    return JsonResponse({'error': _('Invalid request')}, status=400)
\ No newline at end of file
+    return JsonResponse({'error': _('Invalid request')}, status=400)
+
+def current_user_name(request):
+    """Name of the current player without creating an anonymous user"""
+    if hasattr(request, 'user') and request.user.is_authenticated:
+        return request.user.username
+    session_id = request.session.get('session_id')
+    return f"anon_{session_id[:8]}" if session_id else _('Anonymous')
+
+
+def get_current_user(request):
+    """The logged-in user, or the anonymous user of this session if it was already created"""
+    if hasattr(request, 'user') and request.user.is_authenticated:
+        return request.user
+
+    session_id = request.session.get('session_id')
+    if not session_id:
+        return None
+    return User.objects.filter(username=f"anon_{session_id[:8]}").first()
+
+
+def get_or_create_current_user(request):
+    """The logged-in user, or the anonymous user of this session (created on first use)"""
+    if hasattr(request, 'user') and request.user.is_authenticated:
+        return request.user
+
+    session_id = request.session.get('session_id')
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        request.session['session_id'] = session_id
+        request.session.modified = True
+
+    # Try to get anonymous user by session_id or create a new one
+    anon_username = f"anon_{session_id[:8]}"
+    anon_user = User.objects.filter(username=anon_username).first()
+    if not anon_user:
+        anon_user = User.objects.create(
+            username=anon_username,
+            email=None,
+            password_hash=None
+        )
+    return anon_user
+
+
+def count_completed_game(request, game):
+    """Add a completed game to the current player's stats"""
+    current_user = get_or_create_current_user(request)
+
+    if not (hasattr(request, 'user') and request.user.is_authenticated):
+        # Set a long-lived cookie so anonymous players keep their stats
+        max_age = 10 * 365 * 24 * 60 * 60  # 10 years in seconds
+        request.session.set_expiry(max_age)
+        request.session.modified = True
+
+    record_completion(current_user.id, game)
+
+
+def persist_completed_game(request, game_type, game_mode_id, target_champion_id, guesses, is_won, score=0,
+                           daily_date=None):
+    """Write a game that was played outside the database, and its guesses, in one transaction"""
+    current_user = get_or_create_current_user(request)
+
+    with transaction.atomic():
+        game = Game.objects.create(
+            session_id=request.session.get('session_id'),
+            game_mode_id=game_mode_id,
+            game_type=game_type,
+            target_champion_id=target_champion_id,
+            is_completed=True,
+            is_won=is_won,
+            attempts_used=len(guesses),
+            score=score,
+            daily_date=daily_date,
+            user=current_user
+        )
+        Guess.objects.bulk_create([
+            Guess(game=game, guess_type='champion', champion_id=champion_id, guess_number=number)
+            for number, champion_id in enumerate(guesses, start=1)
+        ])
+
+    return game, current_user.username
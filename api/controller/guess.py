@@ -2,13 +2,16 @@
 from django.http import JsonResponse
 
 import json
-import uuid
 
 # Change this import to use frontend.models instead of lolgame.models
-from frontend.models import GameMode, Champion, Game, Language, Guess, User, \
-    UserStat, Ability, AbilityTranslation
-from function.general import prepare_guess_feedback, get_champion_details, prepare_ability_guess_feedback, \
-    get_ability_details
+from frontend.models import GameMode, Champion, Game, Language
+from api.controller.games import count_completed_game, current_user_name, persist_completed_game
+from function.game_token import read_game_token, issue_game_token, claim_step
+from function.guess_engine import GuessError, submit_champion_guess
+from function.general import prepare_guess_feedback, get_champion_details
+from function.scoring import calculate_score
+from function.champion_matrix import get_champion_matrix
+from function.translation_catalog import get_translation_catalog
 
 from django.utils.translation import gettext as _
 
@@ -21,147 +24,26 @@ def make_guess(request):
             champion_id = data.get('champion_id')
             game_id = data.get('game_id')
 
+            # Stateless games carry their state in a signed token instead of a Game row
+            if data.get('game_token'):
+                return make_token_guess(request, data['game_token'], champion_id)
+
             if not champion_id or not game_id:
                 return JsonResponse({'error': _('Missing parameters')}, status=400)
 
-            # Get the game
+            # Lock the game, store the guess and update the game in one transaction
             try:
-                game = Game.objects.get(id=game_id)
-            except Game.DoesNotExist:
-                return JsonResponse({'error': _('Game not found')}, status=404)
+                result = submit_champion_guess(game_id, champion_id)
+            except GuessError as e:
+                return JsonResponse({'error': e.message}, status=e.status)
 
-            # Check if game is already completed
-            if game.is_completed:
-                return JsonResponse({'error': _('Game already completed')}, status=400)
+            game = result.game
+            is_correct = result.is_correct
+            score = result.score
 
-            # Check if max attempts reached
-            if game.attempts_used >= game.game_mode.max_attempts:
-                return JsonResponse({'error': _('Max attempts reached')}, status=400)
-
-            # Get the guessed champion
-            try:
-                guessed_champion = Champion.objects.get(id=champion_id)
-            except Champion.DoesNotExist:
-                return JsonResponse({'error': _('Champion not found')}, status=404)
-
-            previous_guess = Guess.objects.filter(
-                game_id=game_id,
-                champion_id=champion_id
-            ).exists()
-
-            if previous_guess:
-                return JsonResponse({
-                    'error': _('You have already guessed this champion')
-                }, status=400)
-
-            # Create the guess
-            guess_number = game.attempts_used + 1
-            guess = Guess.objects.create(
-                game=game,
-                guess_type='champion',
-                champion=guessed_champion,
-                guess_number=guess_number
-            )
-
-            # Update game attempts
-            game.attempts_used = guess_number
-
-            # Check if correct guess
-            is_correct = (game.target_champion_id == int(champion_id))
-
-            # Calculate score based on difficulty and attempts
-            score = 0
-            if is_correct:
-                # Calculate score based on difficulty and remaining attempts
-                if game.game_mode.name.lower() == 'easy':
-                    max_score = 20
-                elif game.game_mode.name.lower() == 'medium':
-                    max_score = 28
-                elif game.game_mode.name.lower() == 'hard':
-                    max_score = 36
-                else:
-                    max_score = 30  # Default score
-
-                # Calculate score based on attempts used
-                remaining_percentage = (game.game_mode.max_attempts - guess_number + 1) / game.game_mode.max_attempts
-                score = int(max_score * remaining_percentage)
-
-                # Ensure first guess gets full max score
-                if guess_number == 1:
-                    score = max_score
-
-            # If correct or max attempts reached, complete the game
-            if is_correct or game.attempts_used >= game.game_mode.max_attempts:
-                game.is_completed = True
-                game.is_won = is_correct
-                game.save()
-
-                # Update user stats if user is authenticated
-                if hasattr(request, 'user') and request.user.is_authenticated:
-                    user_stat, created = UserStat.objects.get_or_create(
-                        user=request.user,
-                        game_type='champion'
-                    )
-                    user_stat.games_played += 1
-                    if is_correct:
-                        user_stat.games_won += 1
-                        user_stat.total_score += score
-                        if score > user_stat.best_score:
-                            user_stat.best_score = score
-
-                    # Calculate new average attempts
-                    total_attempts = (user_stat.average_attempts * (user_stat.games_played - 1)) + game.attempts_used
-                    user_stat.average_attempts = total_attempts / user_stat.games_played
-                    user_stat.save()
-
-                # Update anonymous user stats using session
-                else:
-                    session_id = request.session.get('session_id')
-                    if not session_id:
-                        # Create a new session ID for anonymous users
-                        session_id = str(uuid.uuid4())
-                        request.session['session_id'] = session_id
-                        # Force session save
-                        request.session.modified = True
-
-                    # Try to get user by session_id or create a new one
-                    anon_username = f"anon_{session_id[:8]}"
-                    anon_user = User.objects.filter(username=anon_username).first()
-                    if not anon_user:
-                        anon_user = User.objects.create(
-                            username=anon_username,
-                            email=None,
-                            password_hash=None
-                        )
-
-                    # Set a long-lived cookie (10 years) to remember this user
-                    max_age = 10 * 365 * 24 * 60 * 60  # 10 years in seconds
-                    request.session.set_expiry(max_age)
-                    # Force session save
-                    request.session.modified = True
-
-                    # Update user stats
-                    user_stat, created = UserStat.objects.get_or_create(
-                        user=anon_user,
-                        game_type='champion'
-                    )
-                    user_stat.games_played += 1
-                    if is_correct:
-                        user_stat.games_won += 1
-                        user_stat.total_score += score
-                        if score > user_stat.best_score:
-                            user_stat.best_score = score
-
-                    # Calculate new average attempts
-                    if user_stat.games_played > 0:
-                        total_attempts = (user_stat.average_attempts * (
-                                user_stat.games_played - 1)) + game.attempts_used
-                        user_stat.average_attempts = total_attempts / user_stat.games_played
-                    else:
-                        user_stat.average_attempts = game.attempts_used
-                    user_stat.save()
-            else:
-                game.save()
+            # Update user stats when the game is completed
+            if result.game_completed:
+                count_completed_game(request, game)
 
             # Get language for translations
             language_code = request.LANGUAGE_CODE
@@ -173,11 +55,9 @@ def make_guess(request):
                 'game_completed': game.is_completed,
                 'attempts_used': game.attempts_used,
                 'max_attempts': game.game_mode.max_attempts,
-                'feedback': prepare_guess_feedback(game.target_champion, guessed_champion, language),
-                'score': score if is_correct else 0,
-                'user': anon_username if 'anon_user' in locals() else (request.user.username if hasattr(request,
-                                                                                                        'user') and request.user.is_authenticated else _(
-                    'Anonymous'))
+                'feedback': prepare_guess_feedback(game.target_champion_id, result.guessed.id, language),
+                'score': score,
+                'user': current_user_name(request)
             }
 
             # If game completed, add target champion details
@@ -191,6 +71,74 @@ def make_guess(request):
     return JsonResponse({'error': _('Invalid request method')}, status=400)
 
 
+def make_token_guess(request, game_token, champion_id):
+    """Apply a guess to a stateless game token; only a completed game is written to the database"""
+    if not champion_id:
+        return JsonResponse({'error': _('Missing parameters')}, status=400)
+
+    state = read_game_token(game_token)
+    if state is None:
+        return JsonResponse({'error': _('Invalid game token')}, status=400)
+
+    game_mode = GameMode.objects.filter(id=state.game_mode_id).first()
+    if not game_mode:
+        return JsonResponse({'error': _('Game not found')}, status=404)
+
+    # Check if game is already completed
+    if state.target_id in state.guesses or len(state.guesses) >= game_mode.max_attempts:
+        return JsonResponse({'error': _('Game already completed')}, status=400)
+
+    # Get the guessed champion
+    guessed_champion = get_champion_matrix().get(champion_id)
+    if guessed_champion is None:
+        return JsonResponse({'error': _('Champion not found')}, status=404)
+
+    if guessed_champion.id in state.guesses:
+        return JsonResponse({
+            'error': _('You have already guessed this champion')
+        }, status=400)
+
+    # Each token state advances once: replaying an earlier token to try other champions is refused
+    if not claim_step(state):
+        return JsonResponse({'error': _('This game token has already been used')}, status=400)
+
+    guesses = state.guesses + [guessed_champion.id]
+    attempts_used = len(guesses)
+    is_correct = state.target_id == guessed_champion.id
+    game_completed = is_correct or attempts_used >= game_mode.max_attempts
+
+    score = calculate_score(game_mode, attempts_used, is_correct)
+    user_name = current_user_name(request)
+
+    if game_completed:
+        game, user_name = persist_completed_game(
+            request, 'champion', game_mode.id, state.target_id, guesses, is_correct, score
+        )
+        count_completed_game(request, game)
+
+    # Get language for translations
+    language = Language.objects.filter(code=request.LANGUAGE_CODE).first()
+
+    response_data = {
+        'is_correct': is_correct,
+        'game_completed': game_completed,
+        'attempts_used': attempts_used,
+        'max_attempts': game_mode.max_attempts,
+        'feedback': prepare_guess_feedback(state.target_id, guessed_champion.id, language),
+        'score': score,
+        'user': user_name
+    }
+
+    if game_completed:
+        response_data['target_champion'] = get_champion_details(Champion.objects.get(id=state.target_id), language)
+    else:
+        response_data['game_token'] = issue_game_token(
+            state.target_id, state.game_mode_id, guesses, nonce=state.nonce
+        )
+
+    return JsonResponse(response_data)
+
+
 def make_ability_guess(request):
     """AJAX endpoint to submit an ability guess"""
     if request.method == 'POST':
@@ -235,13 +183,7 @@ def make_ability_guess(request):
 
             # Eğer dil varsa, yetenek adının çevirisini bul
             if language:
-                ability_translation = AbilityTranslation.objects.filter(
-                    ability=game.target_ability,
-                    language=language
-                ).first()
-
-                if ability_translation and ability_translation.name:
-                    ability_name = ability_translation.name
+                ability_name = get_translation_catalog().name('ability', game.target_ability_id, language)
 
             # Sonuç verisini hazırla
             response_data = {
@@ -1,11 +1,15 @@
 from django.urls import path
 
-from api.controller import champions, guess, games, game_history, ability_game
+from api.controller import champions, guess, games, game_history, ability_game, candidates, daily
 
 urlpatterns = [
     path('search-champions', champions.search_champions, name='search_champions'),
+    path('search-bundle/<str:digest>.json', champions.search_bundle, name='search_bundle'),
     path('make-guess', guess.make_guess, name='make_guess'),
+    path('remaining-champions', candidates.remaining_champions, name='remaining_champions'),
     path('new-game', games.new_game, name='new_game'),
+    path('new-daily-game', daily.new_daily_game, name='new_daily_game'),
+    path('make-daily-guess', daily.make_daily_guess, name='make_daily_guess'),
     path('game-history', game_history.game_history, name='game_history_api'),
     path('champions', champions.champions_api, name='champions_api'),
     path('champion-details', champions.champion_details, name='champion_details_api'),
@@ -0,0 +1,14 @@
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from function.champion_analytics import rollup_champion_analytics
+
+
+@csrf_exempt
+def rollup_analytics(request):
+    """API endpoint to fold newly completed games into the champion analytics tables"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+
+    processed = rollup_champion_analytics()
+    return JsonResponse({'success': True, 'games_processed': processed})
@@ -16,6 +16,9 @@ from frontend.models import (
     Ability, AbilityTranslation,
     ChampionSkin, ChampionSkinTranslation
 )
+from function.ability_clues import warm_clue_catalog
+from function.catalog_version import bump_catalog_version
+from function.search_index import warm_search_index
 
 
 def create_media_directories():
@@ -1222,6 +1225,12 @@ def update_champions(request):
         # Add delay between champions
         time.sleep(2)
 
+    # Champion data changed, rebuild the in-memory champion caches
+    if results:
+        bump_catalog_version()
+        warm_clue_catalog(Language.objects.all())
+        warm_search_index([code for code, _name in settings.LANGUAGES])
+
     return JsonResponse({
         'success': error_count == 0,
         'champions_updated': len(results),
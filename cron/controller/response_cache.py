@@ -0,0 +1,11 @@
+from django.http import JsonResponse
+
+from function.response_cache import response_cache_stats as get_response_cache_stats
+
+
+def response_cache_stats(request):
+    """Hit and miss counters of the cached champion catalog endpoints, counted by the process serving this request"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET method is allowed'}, status=405)
+
+    return JsonResponse({'endpoints': get_response_cache_stats()})
@@ -0,0 +1,16 @@
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from function.game_token import delete_expired_claims
+from function.shared_cache import delete_expired_cache_entries
+
+
+@csrf_exempt
+def expire_cache(request):
+    """API endpoint to delete the expired entries of the shared database cache and the expired game token claims"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+
+    deleted = delete_expired_cache_entries()
+    claims_deleted = delete_expired_claims()
+    return JsonResponse({'success': True, 'entries_deleted': deleted, 'claims_deleted': claims_deleted})
@@ -1,7 +1,10 @@
 from django.urls import path
 
-from cron.controller import champion_updater
+from cron.controller import analytics, champion_updater, response_cache, shared_cache
 
 urlpatterns = [
     path('update-champions/', champion_updater.update_champions, name='update_champions'),
+    path('rollup-analytics/', analytics.rollup_analytics, name='rollup_analytics'),
+    path('response-cache-stats/', response_cache.response_cache_stats, name='response_cache_stats'),
+    path('expire-cache/', shared_cache.expire_cache, name='expire_cache'),
 ]
\ No newline at end of file
@@ -1,18 +1,29 @@
 from django.db.models import Min, Max, Q
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
-import random
 import json
 import uuid
 
 # Change this import to use frontend.models instead of lolgame.models
-from frontend.models import GameMode, Champion, Game, Language, ChampionTranslation, PositionTranslation, Guess, User, \
-    UserStat, CombatRangeTranslation, RegionTranslation, SpeciesTranslation, GenderTranslation, ResourceTranslation, \
-    Region, Species, Resource, CombatRange, Gender, Position, ChampionSkinTranslation, AbilityTranslation, Ability
+from frontend.models import GameMode, Champion, Game, Language, Guess, User, UserStat
+from function.ability_clues import render_clues
+from function.champion_analytics import get_champion_analytics
+from function.daily_challenge import get_daily_target, start_daily_state, utc_today
+from function.game_token import issue_game_token
 from function.general import get_champion_details, prepare_guess_feedback
+from function.leaderboard import PERIODS as LEADERBOARD_PERIODS, get_leaderboard
+from function.search_index import get_search_index
+from function.target_sampler import get_target_sampler, recent_targets, remember_target
+from function.translation_catalog import get_translation_catalog
+
+
+def search_bundle_url(request):
+    """URL of the current language's autocomplete bundle, changes whenever its content does"""
+    return reverse('search_bundle', kwargs={'digest': get_search_index().bundle(request.LANGUAGE_CODE).digest})
 
 
 def main(request):
@@ -39,9 +50,6 @@ def games(request):
         GameMode.objects.get_or_create(name='Hard', defaults={'max_attempts': 6})
         game_mode = GameMode.objects.filter(name__iexact=difficulty).first()
 
-    # Get all champions
-    champions = Champion.objects.all()
-
     # Get session or create new one
     session_id = request.session.get('session_id')
     if not session_id:
@@ -68,6 +76,7 @@ def games(request):
     # Check if there's an existing game in progress
     game_id = request.session.get('game_id')
     existing_game = None
+    game_token = None
     if game_id:
         try:
             existing_game = Game.objects.get(id=game_id)
@@ -86,22 +95,31 @@ def games(request):
             game.user = current_user
             game.save()
     else:
-        # Choose a random champion to guess
-        target_champion = random.choice(list(champions)) if champions.exists() else None
+        # Choose a random champion to guess, skipping the player's recent targets
+        target_champion_id = get_target_sampler().champion(
+            exclude=recent_targets(request.session, 'champion'),
+            game_mode=game_mode
+        )
 
         # Create a new game instance
-        if target_champion and game_mode:
+        if target_champion_id and game_mode and settings.STATELESS_GAMES:
+            # Stateless mode: the client keeps the game in a signed token until it is completed
+            game = None
+            game_token = issue_game_token(target_champion_id, game_mode.id)
+            remember_target(request.session, 'champion', target_champion_id)
+        elif target_champion_id and game_mode:
             game = Game.objects.create(
                 session_id=session_id,
                 game_mode=game_mode,
                 game_type='champion',
-                target_champion=target_champion,
+                target_champion_id=target_champion_id,
                 is_completed=False,
                 user=current_user  # Associate the game with the user
             )
 
             # Store the game ID in session
             request.session['game_id'] = game.id
+            remember_target(request.session, 'champion', target_champion_id)
             request.session.modified = True  # Force session save
         else:
             game = None
@@ -114,15 +132,17 @@ def games(request):
     attempts_used = 0
 
     if existing_game:
-        guesses = Guess.objects.filter(game=existing_game).order_by('guess_number')
+        guessed_ids = Guess.objects.filter(
+            game=existing_game,
+            champion_id__isnull=False
+        ).order_by('guess_number').values_list('champion_id', flat=True)
         attempts_used = existing_game.attempts_used
 
         language = Language.objects.filter(code=current_language).first()
 
-        for guess in guesses:
-            if guess.champion:
-                feedback = prepare_guess_feedback(existing_game.target_champion, guess.champion, language)
-                previous_guesses.append(feedback)
+        for champion_id in guessed_ids:
+            feedback = prepare_guess_feedback(existing_game.target_champion_id, champion_id, language)
+            previous_guesses.append(feedback)
 
     # Calculate attempts left (instead of using a template filter)
     attempts_left = max_attempts - attempts_used
@@ -137,10 +157,59 @@ def games(request):
         'difficulty_title': _(difficulty),
         'max_attempts': max_attempts,
         'game_id': game.id if game else None,
+        'game_token': game_token,
         'attempts_used': attempts_used,
         'attempts_left': attempts_left,
         'previous_guesses': json.dumps(previous_guesses) if previous_guesses else None,
-        'user_name': user_name
+        'user_name': user_name,
+        'search_bundle_url': search_bundle_url(request)
+    })
+
+
+def daily_game(request):
+    """Daily challenge page: every player guesses the same champion per UTC day"""
+    # Get current language
+    current_language = request.LANGUAGE_CODE
+
+    # Get game difficulty from query parameters or default to medium
+    difficulty = request.GET.get('difficulty', 'medium')
+
+    game_mode = GameMode.objects.filter(name__iexact=difficulty).first()
+    if not game_mode:
+        game_mode = GameMode.objects.filter(name__iexact='medium').first()
+
+    # The day's target comes from the cache; the game itself stays in the session until it is completed
+    day = utc_today()
+    target_champion_id = get_daily_target(day)
+    state = start_daily_state(request.session, game_mode, day) if game_mode and target_champion_id else None
+
+    previous_guesses = []
+    attempts_used = 0
+    max_attempts = game_mode.max_attempts if game_mode else 8  # Default to medium
+
+    if state:
+        language = Language.objects.filter(code=current_language).first()
+        attempts_used = len(state['guesses'])
+        max_attempts = state['max_attempts']
+        previous_guesses = [
+            prepare_guess_feedback(target_champion_id, champion_id, language)
+            for champion_id in state['guesses']
+        ]
+
+    return render(request, 'champion_game.html', {
+        'title': _('Game Page Title'),
+        'seo_desc': _('Game Page Desc'),
+        'difficulty': difficulty,
+        'difficulty_title': _(difficulty),
+        'max_attempts': max_attempts,
+        'game_id': 'daily' if state else None,
+        'attempts_used': attempts_used,
+        'attempts_left': max_attempts - attempts_used,
+        'previous_guesses': json.dumps(previous_guesses) if previous_guesses else None,
+        'user_name': None,
+        'is_daily': True,
+        'search_bundle_url': search_bundle_url(request),
+        'guess_url': 'make-daily-guess'
     })
 
 
@@ -163,39 +232,36 @@ def leaderboard(request):
 
     # Get difficulty filter from query parameters
     difficulty = request.GET.get('difficulty', None)
+    game_mode = GameMode.objects.filter(name__iexact=difficulty).first() if difficulty else None
+    if not game_mode:
+        difficulty = None
+
+    # Get time window from query parameters: daily, weekly or all
+    period = request.GET.get('period', 'all')
+    if period not in LEADERBOARD_PERIODS:
+        period = 'all'
 
-    # Get top 20 players by total score for this game type
-    top_players = UserStat.objects.filter(
-        game_type=game_type
-    ).order_by('-total_score')[:20]
+    # Top 20 players and the current player's rank come from the in-memory leaderboard
+    board = get_leaderboard(game_type, game_mode=game_mode, period=period)
+    top_players = board.top(20)
 
     # Get current user stats (if logged in or has a session)
     user_stat = None
     user_rank = None
 
+    current_user_id = None
     if hasattr(request, 'user') and request.user.is_authenticated:
-        user_stat = UserStat.objects.filter(
-            user=request.user,
-            game_type=game_type
-        ).first()
+        current_user_id = request.user.id
     else:
         session_id = request.session.get('session_id')
         if session_id:
-            anon_user = User.objects.filter(username=f"anon_{session_id[:8]}").first()
-            if anon_user:
-                user_stat = UserStat.objects.filter(
-                    user=anon_user,
-                    game_type=game_type
-                ).first()
-
-    # Calculate user's rank if they have stats
-    if user_stat:
-        # Count how many users have a higher score
-        higher_scores = UserStat.objects.filter(
-            game_type=game_type,
-            total_score__gt=user_stat.total_score
-        ).count()
-        user_rank = higher_scores + 1  # User's rank
+            current_user_id = User.objects.filter(username=f"anon_{session_id[:8]}").values_list(
+                'id', flat=True
+            ).first()
+
+    if current_user_id:
+        user_stat = board.entry(current_user_id)
+        user_rank = board.rank(current_user_id)
 
     return render(request, 'leaderboard.html', {
         'title': _('Leaderboard Page Title'),
@@ -204,7 +270,8 @@ def leaderboard(request):
         'user_stat': user_stat,
         'user_rank': user_rank,
         'game_type': game_type,
-        'difficulty': difficulty
+        'difficulty': difficulty,
+        'period': period
     })
 
 def game_history_page(request):
@@ -256,96 +323,14 @@ def champions_page(request):
     # Get all champions - make sure we get distinct champions
     champions = Champion.objects.all().distinct()
 
-    # Get all available filters for dropdowns - make sure we get distinct options
-    positions = Position.objects.all().distinct()
-    regions = Region.objects.all().distinct()
-    species = Species.objects.all().distinct()
-    resources = Resource.objects.all().distinct()
-    combat_ranges = CombatRange.objects.all().distinct()
-    genders = Gender.objects.all().distinct()
-
-    # Translate filter options if language exists
-    positions_translated = []
-    regions_translated = []
-    species_translated = []
-    resources_translated = []
-    combat_ranges_translated = []
-    genders_translated = []
-
-    if language:
-        # Positions
-        for position in positions:
-            translation = PositionTranslation.objects.filter(
-                position=position,
-                language=language
-            ).first()
-            positions_translated.append({
-                'id': position.id,
-                'name': translation.name if translation else position.name
-            })
-
-        # Regions
-        for region in regions:
-            translation = RegionTranslation.objects.filter(
-                region=region,
-                language=language
-            ).first()
-            regions_translated.append({
-                'id': region.id,
-                'name': translation.name if translation else region.name
-            })
-
-        # Species
-        for sp in species:
-            translation = SpeciesTranslation.objects.filter(
-                species=sp,
-                language=language
-            ).first()
-            species_translated.append({
-                'id': sp.id,
-                'name': translation.name if translation else sp.name
-            })
-
-        # Resources
-        for resource in resources:
-            translation = ResourceTranslation.objects.filter(
-                resource=resource,
-                language=language
-            ).first()
-            resources_translated.append({
-                'id': resource.id,
-                'name': translation.name if translation else resource.name
-            })
-
-        # Combat Ranges
-        for cr in combat_ranges:
-            translation = CombatRangeTranslation.objects.filter(
-                combat_range=cr,
-                language=language
-            ).first()
-            combat_ranges_translated.append({
-                'id': cr.id,
-                'name': translation.name if translation else cr.name
-            })
-
-        # Genders
-        for gender in genders:
-            translation = GenderTranslation.objects.filter(
-                gender=gender,
-                language=language
-            ).first()
-            genders_translated.append({
-                'id': gender.id,
-                'name': translation.name if translation else gender.name
-            })
-    else:
-        # If no language, just use default names
-        positions_translated = [{'id': p.id, 'name': p.name} for p in positions]
-        regions_translated = [{'id': r.id, 'name': r.name} for r in regions]
-        species_translated = [{'id': s.id, 'name': s.name} for s in species]
-        resources_translated = [{'id': r.id, 'name': r.name} for r in resources]
-        combat_ranges_translated = [{'id': c.id, 'name': c.name} for c in combat_ranges]
-        genders_translated = [{'id': g.id, 'name': g.name} for g in genders]
+    # Get all available filters for dropdowns, translated from the catalog
+    catalog = get_translation_catalog()
+    positions_translated = catalog.options('position', language)
+    regions_translated = catalog.options('region', language)
+    species_translated = catalog.options('species', language)
+    resources_translated = catalog.options('resource', language)
+    combat_ranges_translated = catalog.options('combat_range', language)
+    genders_translated = catalog.options('gender', language)
 
     # Get min and max release years for the slider - use distinct values
     min_year = Champion.objects.aggregate(Min('release_year'))['release_year__min'] or 2009
@@ -382,6 +367,7 @@ def champion_detail(request, champion_slug):
         return redirect('champions_page')
 
     # Get champion details with translations
+    catalog = get_translation_catalog()
     champion_data = get_champion_details(champion, language)
 
     # Define the ability key order
@@ -405,13 +391,8 @@ def champion_detail(request, champion_slug):
 
                 # Get translation if available
                 if language:
-                    ability_trans = AbilityTranslation.objects.filter(
-                        ability=ability,
-                        language=language
-                    ).first()
-                    if ability_trans:
-                        ability_data['name'] = ability_trans.name
-                        ability_data['description'] = ability_trans.description
+                    ability_data['name'] = catalog.name('ability', ability.id, language)
+                    ability_data['description'] = catalog.text('ability', ability.id, 'description', language)
 
                 abilities.append(ability_data)
                 break
@@ -427,12 +408,7 @@ def champion_detail(request, champion_slug):
 
         # Get translation if available
         if language:
-            skin_trans = ChampionSkinTranslation.objects.filter(
-                skin=skin,
-                language=language
-            ).first()
-            if skin_trans:
-                skin_data['name'] = skin_trans.name
+            skin_data['name'] = catalog.name('skin', skin.id, language)
 
         skins.append(skin_data)
 
@@ -440,18 +416,13 @@ def champion_detail(request, champion_slug):
     meta_description = ""
     if language:
         # Try to get translated meta description
-        translation = ChampionTranslation.objects.filter(
-            champion=champion,
-            language=language
-        ).first()
+        translated_meta = catalog.text('champion', champion.id, 'meta_description', language)
 
-        if translation and translation.meta_description:
-            meta_description = translation.meta_description
+        if translated_meta:
+            meta_description = translated_meta
         else:
             # Generate meta description based on lore if available
-            if translation and translation.lore:
-                meta_description = translation.lore[:160] + "..." if len(translation.lore) > 160 else translation.lore
-            elif champion_data['lore']:
+            if champion_data['lore']:
                 meta_description = champion_data['lore'][:160] + "..." if len(champion_data['lore']) > 160 else \
                 champion_data['lore']
             else:
@@ -483,10 +454,23 @@ def champion_detail(request, champion_slug):
         "publisher": "Riot Games"
     }
 
+    # Precomputed game stats of this champion per game mode
+    game_stats = [
+        {
+            'difficulty': stat.game_mode.name,
+            'times_targeted': stat.times_targeted,
+            'win_rate': stat.win_rate,
+            'average_attempts': stat.average_attempts,
+            'confused_with': [catalog.name('champion', guessed_id, language) for guessed_id, _count in stat.confused_with]
+        }
+        for stat in get_champion_analytics(champion)
+    ]
+
     return render(request, 'champion_detail.html', {
         'champion': champion_data,
         'abilities': abilities,
         'skins': skins,
+        'game_stats': game_stats,
         'meta_description': meta_description,
         'canonical_url': canonical_url,
         'structured_data': json.dumps(structured_data)
@@ -580,21 +564,21 @@ def ability_game(request):
             target_ability_key = target_ability.ability_key if target_ability else None
 
             # Get existing clues
-            clues = get_existing_clues(game)
+            clues = get_existing_clues(game, Language.objects.filter(code=current_language).first())
 
     # Eğer mevcut oyun yoksa veya geçersizse, yeni bir oyun başlat
     if not existing_game:
         # Choose a random champion and one of their abilities
-        target_champion, target_ability = select_random_champion_and_ability()
+        target_champion_id, target_ability = select_random_champion_and_ability(request.session)
 
-        if target_champion and target_ability:
+        if target_champion_id and target_ability:
             # Create a new game instance
             game = Game.objects.create(
                 session_id=session_id,
                 game_mode=game_mode,
                 game_type='ability',
-                target_champion=target_champion,
-                target_ability=target_ability,
+                target_champion_id=target_champion_id,
+                target_ability_id=target_ability.id,
                 is_completed=False,
                 user=current_user,
                 is_grey_mode=is_grey_mode
@@ -606,7 +590,6 @@ def ability_game(request):
 
             # Set variables for template
             ability_image = target_ability.image_url if target_ability else "/static/img/ability_placeholder.png"
-            target_champion_id = target_champion.id
             target_ability_key = target_ability.ability_key
             attempts_used = 0
         else:
@@ -642,37 +625,24 @@ def ability_game(request):
         'target_champion_id': target_champion_id,
         'target_ability_key': target_ability_key,
         'initial_clues': json.dumps(clues) if clues else '[]',
-        'user_name': user_name
+        'user_name': user_name,
+        'search_bundle_url': search_bundle_url(request)
     })
 
-def select_random_champion_and_ability():
-    """Select a random champion and one of their abilities"""
-    # Get all champions that have abilities
-    champions_with_abilities = Champion.objects.filter(abilities__isnull=False).distinct()
-
-    if not champions_with_abilities.exists():
-        return None, None
-
-    # Select a random champion
-    target_champion = random.choice(list(champions_with_abilities))
-
-    # Get all abilities for this champion
-    abilities = Ability.objects.filter(champion=target_champion)
-
-    if not abilities.exists():
-        return target_champion, None
+def select_random_champion_and_ability(session=None):
+    """Select a random champion id and one of their abilities, skipping the player's recent targets"""
+    exclude = recent_targets(session, 'ability_champion') if session is not None else ()
+    target_champion_id, target_ability = get_target_sampler().champion_and_ability(exclude=exclude)
 
-    # Select a random ability
-    target_ability = random.choice(list(abilities))
+    if target_champion_id and session is not None:
+        remember_target(session, 'ability_champion', target_champion_id)
 
-    return target_champion, target_ability
+    return target_champion_id, target_ability
 
 
-def get_existing_clues(game):
+def get_existing_clues(game, language=None):
     """Get existing clues for a game in progress"""
-    # In a real implementation, you would store clues in the database
-    # For now, we'll return an empty list
-    return []
+    return render_clues(game.target_champion_id, game.clues, language)
 
 def games_menu(request):
     """Games menu page showing all available games"""
@@ -324,6 +324,7 @@ class GameMode(models.Model):
     name = models.CharField(max_length=50)
     description = models.TextField(blank=True, null=True)
     max_attempts = models.IntegerField(blank=True, null=True)
+    max_score = models.IntegerField(blank=True, null=True)
 
     class Meta:
         db_table = 'game_modes'
@@ -365,6 +366,7 @@ class Game(models.Model):
         ('champion', 'Champion'),
         ('ability', 'Ability'),
         ('item', 'Item'),
+        ('daily', 'Daily'),
     ]
 
     user = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True)
@@ -381,11 +383,20 @@ class Game(models.Model):
     is_won = models.BooleanField(default=False)
     attempts_used = models.IntegerField(default=0)
     is_grey_mode = models.BooleanField(default=False)
+    score = models.IntegerField(default=0)
+    clues = models.JSONField(default=list, blank=True, null=True)  # Ability game clue types, in the order given
+    daily_date = models.DateField(blank=True, null=True)  # UTC day of a daily challenge game
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
 
     class Meta:
         db_table = 'games'
+        # One daily challenge per player and day; other games have no daily_date
+        unique_together = ('user', 'daily_date')
+        indexes = [
+            models.Index(fields=['is_completed', 'updated_at'], name='games_completed_updated_idx'),
+            models.Index(fields=['user', 'game_type', 'is_completed', 'created_at'], name='games_user_history_idx'),
+        ]
 
     def __str__(self):
         return f"Game {self.id} - {self.game_type} - {self.user.username if self.user else 'Anonymous'}"
@@ -408,6 +419,7 @@ class Guess(models.Model):
 
     class Meta:
         db_table = 'guesses'
+        unique_together = ('game', 'champion')
 
     def __str__(self):
         return f"Guess {self.guess_number} for Game {self.game.id}"
@@ -421,14 +433,122 @@ class UserStat(models.Model):
     average_attempts = models.FloatField(default=0)
     total_score = models.IntegerField(default=0)  # New field for total score
     best_score = models.IntegerField(default=0)   # New field for best single game score
+    updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
 
     class Meta:
         db_table = 'user_stats'
+        unique_together = ('user', 'game_type')
+        indexes = [
+            models.Index(fields=['game_type', 'updated_at'], name='user_stats_type_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.game_type} Stats"
 
 
+class LeaderboardRollup(models.Model):
+    PERIOD_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('all', 'All time'),
+    ]
+
+    # game_type:game_mode_id:period:period_start, one board per key
+    board = models.CharField(max_length=100)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_rollups')
+    game_type = models.CharField(max_length=50)
+    game_mode = models.ForeignKey(GameMode, on_delete=models.CASCADE, blank=True, null=True)  # None = all modes
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    games_played = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    average_attempts = models.FloatField(default=0)
+    total_score = models.IntegerField(default=0)
+    best_score = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
+
+    class Meta:
+        db_table = 'leaderboard_rollups'
+        unique_together = ('board', 'user')
+        indexes = [
+            models.Index(fields=['board', 'updated_at'], name='lb_rollups_board_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.board}"
+
+
+class ChampionStat(models.Model):
+    champion = models.ForeignKey(Champion, on_delete=models.CASCADE, related_name='game_stats')
+    game_mode = models.ForeignKey(GameMode, on_delete=models.CASCADE)
+    times_targeted = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    total_attempts = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
+
+    class Meta:
+        db_table = 'champion_stats'
+        unique_together = ('champion', 'game_mode')
+
+    def __str__(self):
+        return f"{self.champion.name} - {self.game_mode.name} Stats"
+
+
+class ChampionConfusion(models.Model):
+    target_champion = models.ForeignKey(Champion, on_delete=models.CASCADE, related_name='confusions')
+    guessed_champion = models.ForeignKey(Champion, on_delete=models.CASCADE, related_name='+')
+    game_mode = models.ForeignKey(GameMode, on_delete=models.CASCADE)
+    times_guessed = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'champion_confusions'
+        unique_together = ('target_champion', 'guessed_champion', 'game_mode')
+
+    def __str__(self):
+        return f"{self.guessed_champion.name} guessed for {self.target_champion.name}"
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    last_updated_at = models.DateTimeField(blank=True, null=True)
+    last_id = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'rollup_watermarks'
+
+    def __str__(self):
+        return self.name
+
+
+class VersionStamp(models.Model):
+    # Counters every process polls to see that shared data changed, e.g. the champion catalog
+    name = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=1)
+
+    class Meta:
+        db_table = 'version_stamps'
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class GameTokenClaim(models.Model):
+    # One row per step of a token game, so a replayed token cannot advance the same step twice
+    nonce = models.CharField(max_length=16)
+    step = models.SmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'game_token_claims'
+        unique_together = ('nonce', 'step')
+        indexes = [
+            models.Index(fields=['created_at'], name='game_token_claims_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.nonce}:{self.step}"
+
+
 class ChampionMedia(models.Model):
     champion = models.ForeignKey(Champion, on_delete=models.CASCADE, related_name='media')
     media_type = models.CharField(max_length=50)
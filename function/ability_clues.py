@@ -0,0 +1,169 @@
+import threading
+
+from django.utils import translation
+from django.utils.translation import gettext as _
+
+from function.catalog_version import CatalogCache
+from function.champion_matrix import get_champion_matrix
+from function.translation_catalog import get_translation_catalog
+
+
+def build_champion_clues(row, catalog, language=None):
+    """Every clue of a champion row in the order they are given, in the active language"""
+    clues = []
+
+    # Pozisyon ipucu
+    if row and row.position_id:
+        clues.append({
+            'type': 'position',
+            'text': _("Champion plays %s position") % catalog.name('position', row.position_id, language)
+        })
+
+    # Cinsiyet ipucu
+    if row and row.gender_id:
+        clues.append({
+            'type': 'gender',
+            'text': _("Champion gender is %s") % catalog.name('gender', row.gender_id, language)
+        })
+
+    # Kaynak ipucu
+    if row and row.resource_id:
+        clues.append({
+            'type': 'resource',
+            'text': _("Champion uses %s") % catalog.name('resource', row.resource_id, language)
+        })
+
+    # Tür ipucu
+    if row and row.species_id:
+        clues.append({
+            'type': 'species',
+            'text': _("Champion species is %s") % catalog.name('species', row.species_id, language)
+        })
+
+    # Bölge ipucu
+    if row and row.region_id:
+        clues.append({
+            'type': 'region',
+            'text': _("Champion is from %s") % catalog.name('region', row.region_id, language)
+        })
+
+    # Çıkış yılı ipucu
+    if row and row.release_year:
+        clues.append({
+            'type': 'release_year',
+            'text': _("Champion was released in %s") % row.release_year
+        })
+
+    # Savaş menzili ipucu
+    if row and row.combat_range_id:
+        clues.append({
+            'type': 'combat_range',
+            'text': _("Champion combat range is %s") % catalog.name('combat_range', row.combat_range_id, language)
+        })
+
+    # Eğer hiç ipucu yoksa, basit bir ipucu ekle
+    if not clues:
+        clues.append({
+            'type': 'basic',
+            'text': _("Try to guess the champion that owns this ability")
+        })
+
+    return tuple(clues)
+
+
+class ClueCatalog:
+    """Process-wide clue lists of every champion, built per language in one pass over the champion matrix"""
+
+    def __init__(self, version):
+        self.version = version
+        self.languages = {}
+        self.lock = threading.Lock()
+
+    def build(self, language=None):
+        """Build the clue lists of every champion for a language, unless they are already built"""
+        code = language.code if language else ''
+        if code in self.languages:
+            return self.languages[code]
+
+        with self.lock:
+            if code not in self.languages:
+                matrix = get_champion_matrix()
+                catalog = get_translation_catalog()
+                # Clue sentences are gettext strings, so render them in the clue language
+                with translation.override(code or None):
+                    self.languages[code] = {
+                        champion_id: build_champion_clues(row, catalog, language)
+                        for champion_id, row in matrix.rows.items()
+                    }
+            return self.languages[code]
+
+    def clues(self, champion, language=None):
+        """Clue list of a champion (instance or id); empty for an unknown champion"""
+        row = get_champion_matrix().get(champion)
+        if row is None:
+            return ()
+        return self.build(language).get(row.id, ())
+
+
+_clue_catalog = CatalogCache(ClueCatalog)
+
+
+def get_clue_catalog():
+    """Return the shared clue catalog of the current catalog version"""
+    return _clue_catalog.get()
+
+
+def warm_clue_catalog(languages):
+    """Build the clue lists of every language up front, e.g. right after a champion update"""
+    clue_catalog = get_clue_catalog()
+    for language in languages:
+        clue_catalog.build(language)
+
+
+def champion_clues(target_champion, language=None):
+    """Every clue of a champion (instance or id) in the order they are given"""
+    clues = get_clue_catalog().clues(target_champion, language)
+    if not clues:
+        return (
+            {
+                'type': 'basic',
+                'text': _("Try to guess the champion that owns this ability")
+            },
+        )
+    return clues
+
+
+def generate_clue(target_champion, guessed_champion, attempt_number, language=None):
+    """Dil destekli ipucu oluşturma fonksiyonu"""
+    # Güvenlik kontrolü - hedef şampiyon None ise boş ipucu döndür
+    if not target_champion:
+        return {
+            'type': 'error',
+            'text': _("No champion information available")
+        }
+
+    clues = champion_clues(target_champion, language)
+
+    # Calculate which clue to return based on attempt number
+    # Simply use modulo to cycle through clues
+    clue_index = (attempt_number - 1) % len(clues) if clues else 0
+
+    return clues[clue_index]
+
+
+def clue_type(game, attempt_number):
+    """Type of the clue given after a wrong guess, stored on the game"""
+    return generate_clue(game.target_champion_id, None, attempt_number)['type']
+
+
+def render_clues(target_champion, clue_types, language=None):
+    """Clues of a game from the clue types stored on it, in the requested language"""
+    if not target_champion:
+        return []
+    clues_by_type = {clue['type']: clue for clue in champion_clues(target_champion, language)}
+    basic_clue = {
+        'type': 'basic',
+        'text': _("Try to guess the champion that owns this ability")
+    }
+    # A clue type the champion no longer has (champion data updated since) falls back to the basic clue
+    return [clues_by_type.get(clue_type, basic_clue) for clue_type in clue_types or []]
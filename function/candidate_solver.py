@@ -0,0 +1,112 @@
+import numpy as np
+
+from function.catalog_version import CatalogCache
+from function.champion_matrix import FEEDBACK_ATTRIBUTES, get_champion_matrix
+
+
+def feedback_statuses(feedback):
+    """Accept compare_champions() output or prepare_guess_feedback() output and return {attribute: status}"""
+    statuses = {}
+    for attribute, value in (feedback or {}).items():
+        if isinstance(value, dict):
+            value = value.get('status')
+        if attribute == 'release_year' or attribute in FEEDBACK_ATTRIBUTES:
+            statuses[attribute] = value
+    return statuses
+
+
+class CandidateSolver:
+    """Champion attributes as integer columns, filtered with boolean masks.
+
+    Missing attributes are stored as 0, so "the feedback has no entry for this
+    attribute" can be expressed as a constraint too.
+    """
+
+    def __init__(self, matrix):
+        self.version = matrix.version
+        rows = sorted(matrix.rows.values(), key=lambda row: row.id)
+        self.ids = np.array([row.id for row in rows], dtype=np.int64)
+        self.index = {champion_id: position for position, champion_id in enumerate(self.ids.tolist())}
+        self.release_year = np.array([row.release_year or 0 for row in rows], dtype=np.int32)
+        self.columns = {
+            attribute: np.array([getattr(row, f'{attribute}_id') or 0 for row in rows], dtype=np.int32)
+            for attribute in FEEDBACK_ATTRIBUTES
+        }
+
+    def mask(self, guesses):
+        """Boolean mask of the champions consistent with every (champion_id, feedback, is_correct) guess"""
+        mask = np.ones(len(self.ids), dtype=bool)
+
+        for champion_id, feedback, is_correct in guesses:
+            position = self.index.get(int(champion_id))
+            if position is None:
+                continue
+
+            if is_correct:
+                mask &= self.ids == self.ids[position]
+                continue
+            mask &= self.ids != self.ids[position]
+
+            statuses = feedback_statuses(feedback)
+
+            year = self.release_year[position]
+            if year:
+                status = statuses.get('release_year')
+                if status == 'correct':
+                    mask &= self.release_year == year
+                elif status == 'high':
+                    mask &= self.release_year > year
+                elif status == 'low':
+                    mask &= (self.release_year < year) & (self.release_year != 0)
+                else:
+                    mask &= self.release_year == 0
+
+            for attribute in FEEDBACK_ATTRIBUTES:
+                column = self.columns[attribute]
+                value = column[position]
+                if not value:
+                    continue
+                status = statuses.get(attribute)
+                if status == 'correct':
+                    mask &= column == value
+                elif status == 'wrong':
+                    mask &= (column != value) & (column != 0)
+                else:
+                    mask &= column == 0
+
+        return mask
+
+    def feedback_codes(self):
+        """Matrix of feedback codes, codes[g, t] for guessing champion g when t is the target.
+
+        Two pairs get the same code exactly when prepare_guess_feedback would
+        report the same statuses and the same hit/miss, so equal codes mean
+        indistinguishable feedback.
+        """
+        guessed = self.release_year[:, None]
+        target = self.release_year[None, :]
+        codes = np.select(
+            [guessed == 0, target == 0, target == guessed, target > guessed],
+            [0, 1, 2, 3],
+            default=4
+        ).astype(np.int64)
+
+        for attribute in FEEDBACK_ATTRIBUTES:
+            guessed = self.columns[attribute][:, None]
+            target = self.columns[attribute][None, :]
+            status = np.select([guessed == 0, target == 0, target == guessed], [0, 1, 2], default=3)
+            codes = codes * 4 + status
+
+        return codes * 2 + np.eye(len(self.ids), dtype=np.int64)
+
+    def remaining(self, guesses):
+        """Ids of the champions still consistent with the guesses"""
+        return self.ids[self.mask(guesses)].tolist()
+
+
+_solver = CatalogCache(lambda version: CandidateSolver(get_champion_matrix()))
+
+
+def get_candidate_solver():
+    """Return the shared solver, rebuilt along with the champion matrix"""
+    return _solver.get()
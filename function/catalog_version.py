@@ -0,0 +1,63 @@
+import threading
+import time
+
+from function.version_stamps import bump_version, read_version
+
+CATALOG_VERSION_NAME = 'champion_catalog'
+
+# Seconds a process keeps using the stamp it read last before asking the database again,
+# so serving from the in-process champion caches does not cost a query per request
+CATALOG_VERSION_TTL = 5
+
+# (version, time.monotonic() it was read)
+_stamp = (None, 0.0)
+
+
+def get_catalog_version():
+    """Return the current champion catalog version stamp, shared by every process through version_stamps"""
+    global _stamp
+
+    version, read_at = _stamp
+    now = time.monotonic()
+    if version is not None and now - read_at < CATALOG_VERSION_TTL:
+        return version
+
+    version = read_version(CATALOG_VERSION_NAME)
+    _stamp = (version, now)
+    return version
+
+
+def bump_catalog_version():
+    """Mark the champion caches of every process as stale (called by the cron updater)"""
+    global _stamp
+
+    version = bump_version(CATALOG_VERSION_NAME)
+    # This process rebuilds right away, the others within CATALOG_VERSION_TTL
+    _stamp = (version, time.monotonic())
+    return version
+
+
+class CatalogCache:
+    """A process-wide object built from the champion catalog, rebuilt once when the catalog version changes.
+
+    build is called with the new version; concurrent readers of a stale object
+    wait for a single rebuild instead of each building their own.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.current = (None, None)
+        self.lock = threading.Lock()
+
+    def get(self):
+        version = get_catalog_version()
+        built_version, value = self.current
+        if value is not None and built_version == version:
+            return value
+
+        with self.lock:
+            built_version, value = self.current
+            if value is None or built_version != version:
+                value = self.build(version)
+                self.current = (version, value)
+            return value
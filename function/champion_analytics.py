@@ -0,0 +1,162 @@
+from collections import Counter, namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from frontend.models import ChampionConfusion, ChampionStat, Game, GameMode, Guess, RollupWatermark
+
+WATERMARK_NAME = 'champion_analytics'
+
+# Game types whose target is guessed champion by champion
+ANALYTICS_GAME_TYPES = ('champion', 'daily')
+
+# Games completed this recently are left for the next run, so a transaction that
+# commits late with an older updated_at can never fall behind the watermark
+SETTLE_DELAY = timedelta(minutes=5)
+
+ChampionModeStats = namedtuple('ChampionModeStats', (
+    'game_mode', 'times_targeted', 'win_rate', 'average_attempts', 'confused_with'
+))
+
+
+def _add_stats(champion_totals):
+    """Add (times_targeted, games_won, total_attempts) per (champion, game mode) to champion_stats"""
+    existing = {
+        (stat.champion_id, stat.game_mode_id): stat
+        for stat in ChampionStat.objects.select_for_update().filter(
+            champion_id__in={champion_id for champion_id, _mode_id in champion_totals},
+            game_mode_id__in={mode_id for _champion_id, mode_id in champion_totals}
+        )
+    }
+    changed, created = [], []
+    for (champion_id, game_mode_id), (targeted, won, attempts) in champion_totals.items():
+        stat = existing.get((champion_id, game_mode_id))
+        if stat is None:
+            created.append(ChampionStat(champion_id=champion_id, game_mode_id=game_mode_id,
+                                        times_targeted=targeted, games_won=won, total_attempts=attempts))
+        else:
+            stat.times_targeted += targeted
+            stat.games_won += won
+            stat.total_attempts += attempts
+            stat.updated_at = timezone.now()
+            changed.append(stat)
+    ChampionStat.objects.bulk_update(changed, ['times_targeted', 'games_won', 'total_attempts', 'updated_at'])
+    ChampionStat.objects.bulk_create(created)
+
+
+def _add_confusions(confusions):
+    """Add wrong guess counts per (target, guessed champion, game mode) to champion_confusions"""
+    existing = {
+        (row.target_champion_id, row.guessed_champion_id, row.game_mode_id): row
+        for row in ChampionConfusion.objects.select_for_update().filter(
+            target_champion_id__in={target_id for target_id, _guessed_id, _mode_id in confusions},
+            guessed_champion_id__in={guessed_id for _target_id, guessed_id, _mode_id in confusions},
+            game_mode_id__in={mode_id for _target_id, _guessed_id, mode_id in confusions}
+        )
+    }
+    changed, created = [], []
+    for (target_id, guessed_id, game_mode_id), count in confusions.items():
+        row = existing.get((target_id, guessed_id, game_mode_id))
+        if row is None:
+            created.append(ChampionConfusion(target_champion_id=target_id, guessed_champion_id=guessed_id,
+                                             game_mode_id=game_mode_id, times_guessed=count))
+        else:
+            row.times_guessed += count
+            changed.append(row)
+    ChampionConfusion.objects.bulk_update(changed, ['times_guessed'])
+    ChampionConfusion.objects.bulk_create(created)
+
+
+def rollup_champion_analytics(chunk_size=1000):
+    """Fold games completed since the last run into champion_stats and champion_confusions.
+
+    Completed games are read in (updated_at, id) order, chunk by chunk, after
+    the watermark saved by the previous run. Each chunk and the new watermark
+    are written in one transaction that holds the watermark row locked, so an
+    interrupted run resumes where it stopped, overlapping runs never process
+    the same chunk, and memory stays bounded by the chunk size. Returns the
+    number of games processed.
+    """
+    RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+    settled = timezone.now() - SETTLE_DELAY
+    games = Game.objects.filter(
+        is_completed=True,
+        game_type__in=ANALYTICS_GAME_TYPES,
+        target_champion__isnull=False,
+        updated_at__lte=settled
+    ).order_by('updated_at', 'id')
+
+    processed = 0
+    while True:
+        with transaction.atomic():
+            # Overlapping runs wait here and then read the watermark the other run saved,
+            # so a chunk is never counted twice
+            watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+            pending = games
+            if watermark.last_updated_at is not None:
+                pending = pending.filter(
+                    Q(updated_at__gt=watermark.last_updated_at) |
+                    Q(updated_at=watermark.last_updated_at, id__gt=watermark.last_id)
+                )
+            chunk = list(pending.values_list(
+                'id', 'target_champion_id', 'game_mode_id', 'is_won', 'attempts_used', 'updated_at'
+            )[:chunk_size])
+            if not chunk:
+                break
+
+            champion_totals = {}
+            game_targets = {}
+            for game_id, champion_id, game_mode_id, is_won, attempts_used, _updated_at in chunk:
+                targeted, won, attempts = champion_totals.get((champion_id, game_mode_id), (0, 0, 0))
+                champion_totals[(champion_id, game_mode_id)] = (
+                    targeted + 1, won + (1 if is_won else 0), attempts + attempts_used
+                )
+                game_targets[game_id] = (champion_id, game_mode_id)
+
+            confusions = Counter()
+            wrong_guesses = Guess.objects.filter(
+                game_id__in=game_targets, champion__isnull=False
+            ).values_list('game_id', 'champion_id')
+            for game_id, champion_id in wrong_guesses.iterator():
+                target_id, game_mode_id = game_targets[game_id]
+                if champion_id != target_id:
+                    confusions[(target_id, champion_id, game_mode_id)] += 1
+
+            _add_stats(champion_totals)
+            _add_confusions(confusions)
+            watermark.last_id = chunk[-1][0]
+            watermark.last_updated_at = chunk[-1][5]
+            watermark.save(update_fields=['last_id', 'last_updated_at'])
+
+        processed += len(chunk)
+    return processed
+
+
+def get_champion_analytics(champion, confused_limit=3):
+    """Precomputed per game mode numbers of a champion, easiest mode first"""
+    game_modes = {game_mode.id: game_mode for game_mode in GameMode.objects.all()}
+
+    confused = {}
+    confusions = ChampionConfusion.objects.filter(target_champion=champion).order_by(
+        'game_mode_id', '-times_guessed', 'guessed_champion_id'
+    ).values_list('game_mode_id', 'guessed_champion_id', 'times_guessed')
+    for game_mode_id, guessed_id, times_guessed in confusions:
+        mode_confused = confused.setdefault(game_mode_id, [])
+        if len(mode_confused) < confused_limit:
+            mode_confused.append((guessed_id, times_guessed))
+
+    analytics = []
+    for stat in ChampionStat.objects.filter(champion=champion, times_targeted__gt=0):
+        game_mode = game_modes.get(stat.game_mode_id)
+        if game_mode is None:
+            continue
+        analytics.append(ChampionModeStats(
+            game_mode,
+            stat.times_targeted,
+            round(stat.games_won / stat.times_targeted * 100),
+            round(stat.total_attempts / stat.times_targeted, 1),
+            confused.get(stat.game_mode_id, [])
+        ))
+    return sorted(analytics, key=lambda row: -(row.game_mode.max_attempts or 0))
@@ -0,0 +1,213 @@
+import threading
+import unicodedata
+from collections import namedtuple
+
+from frontend.models import Champion
+from function.catalog_version import CatalogCache
+from function.champion_matrix import ATTRIBUTE_SOURCES
+from function.search_index import fold
+from function.translation_catalog import get_translation_catalog, language_code
+
+# Filters of the champions page, in the order the page shows them
+FACETS = ('position', 'region', 'species', 'resource', 'combat_range', 'gender')
+
+# Champions without a difficulty come after the hardest ones
+DIFFICULTY_ORDER = {'Easy': 1, 'Medium': 2, 'Hard': 3}
+
+# Orders of the catalog; anything else is sorted by id
+SORT_FIELDS = ('name', 'release_year', 'difficulty', 'id')
+
+# Turkish dictionary order, where ç, ğ, ı, ö, ş and ü are letters of their own; q, w and x sit where loanwords put them
+TURKISH_ALPHABET = 'abcçdefgğhıijklmnoöpqrsştuüvwxyz'
+TURKISH_RANKS = {letter: rank for rank, letter in enumerate(TURKISH_ALPHABET)}
+
+# The fields of a champion the catalog API needs, so listing champions loads no model instances
+ChampionCard = namedtuple('ChampionCard', ('id', 'name', 'slug', 'splash_art', 'release_year', 'difficulty'))
+
+
+def bit_positions(bits):
+    """Positions of the set bits of an int, lowest first"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def collation_key(name, code):
+    """Primary sort key of a champion name in a language.
+
+    Turkish follows its own alphabet, so 'Şivir'-like names come after every
+    's'. Other languages compare accent and case insensitively, which is their
+    dictionary order for Latin and Cyrillic names and for Hangul and kana.
+    """
+    if code != 'tr':
+        return fold(name)
+
+    lowered = unicodedata.normalize('NFC', name.replace('I', 'ı').replace('İ', 'i').lower())
+    key = []
+    for char in lowered:
+        if char in TURKISH_RANKS:
+            key.append(TURKISH_RANKS[char])
+            continue
+        # Other accented letters sort with their base letter, punctuation and spaces are ignored
+        for folded in fold(char).replace(' ', ''):
+            key.append(TURKISH_RANKS.get(folded, len(TURKISH_ALPHABET) + ord(folded)))
+    return tuple(key)
+
+
+class SortOrder:
+    """One precomputed order of the whole catalog; any subset comes out sorted by walking it once"""
+
+    def __init__(self, cards, permutation):
+        self.cards = cards
+        self.permutation = permutation
+        self.ranks = {cards[position].id: rank for rank, position in enumerate(permutation)}
+
+    def champions(self, bits):
+        """ChampionCards of a bitset in this order"""
+        return [self.cards[position] for position in self.permutation if bits >> position & 1]
+
+    def key(self, card):
+        """Cursor key of a champion: its rank in this order, then its id"""
+        return self.ranks[card.id], card.id
+
+
+class ChampionFacets:
+    """Process-wide bitsets of the champion catalog, one per facet value and release year.
+
+    Champion number i of cards (ordered by id) is bit i of every bitset, so a
+    combination of filters is a bitwise AND of a few ints and costs the same
+    however many filters are active. Unlike the champion matrix every link
+    counts, not only the primary one, the same as the former join filters.
+    """
+
+    def __init__(self, version, cards, links):
+        self.version = version
+        self.cards = cards
+        self.positions = {card.id: position for position, card in enumerate(cards)}
+        self.all = (1 << len(cards)) - 1
+        self.orders = {}
+        self.lock = threading.Lock()
+
+        # facet -> value id -> bitset of the champions linked to that value
+        self.bits = {facet: {} for facet in FACETS}
+        for facet, facet_links in links.items():
+            values = self.bits[facet]
+            for champion_id, value_id in facet_links:
+                position = self.positions.get(champion_id)
+                if position is not None:
+                    values[value_id] = values.get(value_id, 0) | 1 << position
+
+        # release year -> bitset, champions without a year match no year range
+        self.year_bits = {}
+        for position, card in enumerate(cards):
+            if card.release_year is not None:
+                self.year_bits[card.release_year] = self.year_bits.get(card.release_year, 0) | 1 << position
+
+    def of_ids(self, champion_ids):
+        """Bitset of the given champion ids"""
+        bits = 0
+        for champion_id in champion_ids:
+            position = self.positions.get(champion_id)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+    def years(self, min_year=None, max_year=None):
+        """Bitset of the champions released in [min_year, max_year]; a missing bound is open"""
+        if min_year is None and max_year is None:
+            return self.all
+        bits = 0
+        for year, year_bits in self.year_bits.items():
+            if (min_year is None or year >= min_year) and (max_year is None or year <= max_year):
+                bits |= year_bits
+        return bits
+
+    def select(self, filters, bits=None):
+        """Bitset of the champions of bits (default all) matching every filter, a dict of facet -> value id"""
+        bits = self.all if bits is None else bits
+        for facet, value_id in filters.items():
+            bits &= self.bits[facet].get(value_id, 0)
+        return bits
+
+    def counts(self, filters, bits=None):
+        """facet -> value id -> number of champions the option would leave, given the other active filters.
+
+        Each facet is counted against the champions matching every filter but
+        its own, so the options of an active facet show what switching to them
+        would return rather than all zeros.
+        """
+        bits = self.all if bits is None else bits
+        counts = {}
+        for facet in FACETS:
+            others = self.select({other: value_id for other, value_id in filters.items() if other != facet}, bits)
+            counts[facet] = {
+                value_id: (others & value_bits).bit_count()
+                for value_id, value_bits in self.bits[facet].items()
+            }
+        return counts
+
+    def champions(self, bits):
+        """ChampionCards of a bitset, ordered by id"""
+        return [self.cards[position] for position in bit_positions(bits)]
+
+    @staticmethod
+    def _sort_key(sort_by, sort_dir, code):
+        """(key of a card, reverse) of a catalog order"""
+        if sort_by == 'name':
+            catalog = get_translation_catalog()
+
+            # The language's collation first, then the exact spelling
+            def name_key(card):
+                name = catalog.name('champion', card.id, code) or card.name
+                return collation_key(name, code), name.casefold(), card.id
+            return name_key, sort_dir == 'desc'
+        if sort_by == 'release_year':
+            # Champions without a year come last in both directions
+            sign = -1 if sort_dir == 'desc' else 1
+            return lambda card: (card.release_year is None, sign * (card.release_year or 0), card.id), False
+        if sort_by == 'difficulty':
+            return lambda card: (DIFFICULTY_ORDER.get(card.difficulty, 4), card.id), sort_dir == 'desc'
+        return lambda card: card.id, False
+
+    def ranked(self, champion_ids):
+        """SortOrder following a ranked list of champion ids, e.g. text search matches"""
+        return SortOrder(self.cards, [self.positions[champion_id] for champion_id in champion_ids
+                                      if champion_id in self.positions])
+
+    def order(self, sort_by, sort_dir, language=None):
+        """SortOrder of the catalog by name (per language), release_year, difficulty or id, computed once"""
+        # Only known orders are cached, so request parameters cannot grow self.orders
+        sort_by = sort_by if sort_by in SORT_FIELDS else 'id'
+        sort_dir = 'desc' if sort_dir == 'desc' and sort_by != 'id' else 'asc'
+        code = (language_code(language) or '') if sort_by == 'name' else ''
+        key = (sort_by, sort_dir, code)
+        order = self.orders.get(key)
+        if order is None:
+            with self.lock:
+                order = self.orders.get(key)
+                if order is None:
+                    sort_key, reverse = self._sort_key(sort_by, sort_dir, code)
+                    permutation = sorted(range(len(self.cards)), key=lambda position: sort_key(self.cards[position]),
+                                         reverse=reverse)
+                    order = SortOrder(self.cards, permutation)
+                    self.orders[key] = order
+        return order
+
+
+def build_champion_facets(version=None):
+    """Load the champion catalog bitsets in one query per facet plus one for the champions"""
+    cards = [ChampionCard(*values) for values in Champion.objects.order_by('id').values_list(*ChampionCard._fields)]
+    links = {
+        facet: list(ATTRIBUTE_SOURCES[facet][0].objects.values_list('champion_id', f'{facet}_id'))
+        for facet in FACETS
+    }
+    return ChampionFacets(version, cards, links)
+
+
+_facets = CatalogCache(build_champion_facets)
+
+
+def get_champion_facets():
+    """Return the shared champion facets of the current catalog version"""
+    return _facets.get()
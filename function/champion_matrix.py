@@ -0,0 +1,94 @@
+from collections import namedtuple
+
+from frontend.models import Champion, ChampionGender, ChampionResource, ChampionPosition, ChampionSpecies, \
+    ChampionCombatRange, ChampionRegion
+from function.catalog_version import CatalogCache
+
+# Attributes compared by the champion game, in the order the feedback reports them
+FEEDBACK_ATTRIBUTES = ('gender', 'resource', 'position', 'species', 'combat_range', 'region')
+
+ChampionRow = namedtuple(
+    'ChampionRow',
+    ('id', 'name', 'image_main', 'release_year') + tuple(f'{attribute}_id' for attribute in FEEDBACK_ATTRIBUTES)
+)
+
+# attribute -> (champion link model, only primary links count)
+ATTRIBUTE_SOURCES = {
+    'gender': (ChampionGender, False),
+    'resource': (ChampionResource, False),
+    'position': (ChampionPosition, True),
+    'species': (ChampionSpecies, True),
+    'combat_range': (ChampionCombatRange, True),
+    'region': (ChampionRegion, True),
+}
+
+
+class ChampionMatrix:
+    """Process-wide, read-only table with one row of attribute ids per champion"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.rows = rows
+
+    def get(self, champion):
+        """Return the row for a Champion instance or champion id, or None"""
+        champion_id = champion.id if isinstance(champion, Champion) else champion
+        try:
+            return self.rows.get(int(champion_id))
+        except (TypeError, ValueError):
+            return None
+
+
+def compare_champions(target, guessed):
+    """Return the feedback status of every attribute both champion rows define"""
+    statuses = {}
+
+    if target.release_year and guessed.release_year:
+        if target.release_year == guessed.release_year:
+            statuses['release_year'] = 'correct'
+        elif target.release_year > guessed.release_year:
+            statuses['release_year'] = 'high'  # Target year is higher
+        else:
+            statuses['release_year'] = 'low'  # Target year is lower
+
+    for attribute in FEEDBACK_ATTRIBUTES:
+        target_value = getattr(target, f'{attribute}_id')
+        guessed_value = getattr(guessed, f'{attribute}_id')
+        if target_value and guessed_value:
+            statuses[attribute] = 'correct' if target_value == guessed_value else 'wrong'
+
+    return statuses
+
+
+def build_champion_matrix(version=None):
+    """Load the champion attribute table in a fixed number of queries"""
+    columns = {}
+
+    for attribute, (link_model, primary_only) in ATTRIBUTE_SOURCES.items():
+        links = link_model.objects.all()
+        if primary_only:
+            links = links.filter(is_primary=True)
+
+        # Keep the lowest id per champion, matching what .first() returned before
+        column = {}
+        for champion_id, value_id in links.order_by('id').values_list('champion_id', f'{attribute}_id'):
+            column.setdefault(champion_id, value_id)
+        columns[attribute] = column
+
+    rows = {}
+    for champion_id, name, image_main, release_year in Champion.objects.values_list(
+            'id', 'name', 'image_main', 'release_year'):
+        rows[champion_id] = ChampionRow(
+            champion_id, name, image_main, release_year,
+            *(columns[attribute].get(champion_id) for attribute in FEEDBACK_ATTRIBUTES)
+        )
+
+    return ChampionMatrix(version, rows)
+
+
+_matrix = CatalogCache(build_champion_matrix)
+
+
+def get_champion_matrix():
+    """Return the shared champion matrix of the current catalog version"""
+    return _matrix.get()
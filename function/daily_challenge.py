@@ -0,0 +1,104 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from frontend.models import Champion, Game
+from function.champion_matrix import get_champion_matrix
+from function.general import get_champion_details
+
+# Keep a day's target pinned well past its own UTC day so it never changes while people play it
+DAILY_CACHE_TIMEOUT = 3 * 24 * 60 * 60
+
+
+def utc_today():
+    # timezone.now() is UTC because USE_TZ is enabled
+    return timezone.now().date()
+
+
+def pick_daily_champion(day):
+    """Deterministic target for a UTC day, identical on every node for the same champion list"""
+    champion_ids = sorted(get_champion_matrix().rows)
+    if not champion_ids:
+        return None
+    digest = hashlib.sha256(f'{settings.SECRET_KEY}:daily:{day.isoformat()}'.encode()).hexdigest()
+    return champion_ids[int(digest, 16) % len(champion_ids)]
+
+
+def get_daily_target(day=None):
+    """The day's target champion id, computed once and then served from the cache"""
+    day = day or utc_today()
+    key = f'daily_challenge:{day.isoformat()}'
+    champion_id = cache.get(key)
+    if champion_id is None:
+        champion_id = pick_daily_champion(day)
+        if champion_id is None:
+            return None
+        # add() keeps whichever node stored the target first
+        cache.add(key, champion_id, DAILY_CACHE_TIMEOUT)
+        champion_id = cache.get(key, champion_id)
+    return champion_id
+
+
+def get_daily_target_details(language, day=None):
+    """get_champion_details() of the day's target, cached per language"""
+    day = day or utc_today()
+    champion_id = get_daily_target(day)
+    if champion_id is None:
+        return None
+
+    key = f'daily_challenge:{day.isoformat()}:details:{language.code if language else ""}'
+    details = cache.get(key)
+    if details is None or details.get('id') != champion_id:
+        details = get_champion_details(Champion.objects.get(id=champion_id), language)
+        cache.set(key, details, DAILY_CACHE_TIMEOUT)
+    return details
+
+
+def warm_daily_challenges(languages, days=2, start=None):
+    """Precompute the targets and target details of the next days into the cache"""
+    start = start or utc_today()
+    warmed = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        champion_id = get_daily_target(day)
+        for language in languages:
+            get_daily_target_details(language, day)
+        warmed.append((day, champion_id))
+    return warmed
+
+
+def get_daily_state(session, day=None):
+    """The player's daily game state for a UTC day, kept in the session until the game is completed"""
+    day = day or utc_today()
+    state = session.get('daily_game')
+    if state and state.get('date') == day.isoformat():
+        return state
+    return None
+
+
+def start_daily_state(session, game_mode, day=None):
+    """Return today's daily game state, starting one if the player has none (one daily game per day)"""
+    day = day or utc_today()
+    state = get_daily_state(session, day)
+    if state is None:
+        state = {
+            'date': day.isoformat(),
+            'game_mode_id': game_mode.id,
+            'max_attempts': game_mode.max_attempts,
+            'guesses': [],
+            'is_completed': False,
+            'is_won': False,
+        }
+        session['daily_game'] = state
+        session.modified = True
+    return state
+
+
+def has_played_daily(user, day=None):
+    """Whether the user already has a daily game stored for a UTC day, from any session"""
+    if user is None:
+        return False
+    return Game.objects.filter(user=user, daily_date=day or utc_today()).exists()
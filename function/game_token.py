@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+import secrets
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from frontend.models import GameTokenClaim
+
+TOKEN_SALT = 'lolgame.game_token'
+
+GameTokenState = namedtuple('GameTokenState', ('nonce', 'target_id', 'game_mode_id', 'guesses'))
+
+
+def _target_pad(nonce):
+    """Per-game pad that hides the target id; the token is signed, not encrypted"""
+    digest = hmac.new(settings.SECRET_KEY.encode(), f'{TOKEN_SALT}:{nonce}'.encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+def issue_game_token(target_id, game_mode_id, guesses=(), nonce=None):
+    """Signed, compact token holding an in-progress game: target, mode and guessed champion ids"""
+    nonce = nonce or secrets.token_urlsafe(9)
+    return signing.dumps(
+        {'n': nonce, 't': target_id ^ _target_pad(nonce), 'm': game_mode_id, 'g': list(guesses)},
+        salt=TOKEN_SALT,
+        compress=True
+    )
+
+
+def read_game_token(token):
+    """Return the GameTokenState of a token, or None if it is forged or expired"""
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=getattr(settings, 'GAME_TOKEN_MAX_AGE', None))
+        return GameTokenState(data['n'], data['t'] ^ _target_pad(data['n']), data['m'], list(data['g']))
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def claim_step(state):
+    """True the first time a guess is applied to this state of a game, False for a replayed token.
+
+    Every token state (nonce, number of guesses) may advance exactly once, so
+    an earlier token cannot be reused to try other champions at the same step
+    or to save the completed game twice. A claim is one INSERT into
+    game_token_claims per guess; a replay is the same INSERT failing on the
+    unique (nonce, step) key. Claims are never evicted while their token is valid.
+    """
+    try:
+        with transaction.atomic():
+            GameTokenClaim.objects.create(nonce=state.nonce, step=len(state.guesses))
+    except IntegrityError:
+        return False
+    return True
+
+
+def delete_expired_claims():
+    """Delete the claims of tokens past GAME_TOKEN_MAX_AGE, which read_game_token rejects anyway"""
+    max_age = getattr(settings, 'GAME_TOKEN_MAX_AGE', None)
+    if not max_age:
+        return 0
+    deleted, _ = GameTokenClaim.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=max_age)).delete()
+    return deleted
@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+
+from frontend.models import Game, Guess
+from function.champion_matrix import get_champion_matrix
+from function.scoring import calculate_score
+
+GuessResult = namedtuple('GuessResult', ('game', 'guessed', 'is_correct', 'score', 'game_completed'))
+
+
+class GuessError(Exception):
+    """A guess that cannot be applied; carries the message and HTTP status for the JSON response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def submit_champion_guess(game_id, champion_id, require_target_ability=False, clue_for=None):
+    """Apply a champion guess to a game in one transaction.
+
+    The game row is locked with SELECT ... FOR UPDATE, so concurrent
+    submissions for the same game run one after the other and can never
+    overrun max_attempts. Duplicate guesses are rejected by the unique
+    (game, champion) key on guesses. Query budget per guess, besides
+    BEGIN/COMMIT: SELECT game + mode + targets FOR UPDATE, SAVEPOINT, INSERT
+    guess, RELEASE SAVEPOINT, UPDATE game. The guessed champion comes from the
+    in-memory champion matrix.
+
+    clue_for(game, attempt_number) returns the type of the clue a wrong guess
+    earns; it is appended to game.clues by the same UPDATE.
+    """
+    guessed = get_champion_matrix().get(champion_id)
+
+    with transaction.atomic():
+        game = Game.objects.select_for_update(of=('self',)).select_related(
+            'game_mode', 'target_champion', 'target_ability'
+        ).filter(id=game_id).first()
+        if game is None:
+            raise GuessError(_('Game not found'), status=404)
+
+        if require_target_ability:
+            # Target champion ve ability kontrolü
+            if not game.target_champion_id:
+                raise GuessError(_('Game has no target champion'))
+            if not game.target_ability_id:
+                raise GuessError(_('Game has no target ability'))
+
+        # Check if game is already completed
+        if game.is_completed:
+            raise GuessError(_('Game already completed'))
+
+        # Check if max attempts reached
+        if game.attempts_used >= game.game_mode.max_attempts:
+            raise GuessError(_('Max attempts reached'))
+
+        if guessed is None:
+            raise GuessError(_('Champion not found'), status=404)
+
+        guess_number = game.attempts_used + 1
+        try:
+            with transaction.atomic():
+                Guess.objects.create(
+                    game=game,
+                    guess_type='champion',
+                    champion_id=guessed.id,
+                    guess_number=guess_number
+                )
+        except IntegrityError:
+            raise GuessError(_('You have already guessed this champion'))
+
+        is_correct = game.target_champion_id == guessed.id
+        score = calculate_score(game.game_mode, guess_number, is_correct)
+
+        game.attempts_used = guess_number
+        if is_correct or guess_number >= game.game_mode.max_attempts:
+            game.is_completed = True
+            game.is_won = is_correct
+            game.score = score
+        update_fields = ['attempts_used', 'is_completed', 'is_won', 'score', 'updated_at']
+        if clue_for and not is_correct:
+            game.clues = (game.clues or []) + [clue_for(game, guess_number)]
+            update_fields.append('clues')
+        game.save(update_fields=update_fields)
+
+    return GuessResult(game, guessed, is_correct, score, game.is_completed)
@@ -0,0 +1,167 @@
+import threading
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from frontend.models import LeaderboardRollup, UserStat
+from function.version_stamps import bump_version, read_version
+
+LeaderboardRow = namedtuple('LeaderboardRow', (
+    'user_id', 'username', 'total_score', 'best_score', 'games_played', 'games_won', 'average_attempts'
+))
+
+ROW_FIELDS = ('user_id', 'user__username', 'total_score', 'best_score', 'games_played', 'games_won',
+              'average_attempts')
+
+PERIODS = ('daily', 'weekly', 'all')
+
+# period_start of the all-time boards
+ALL_TIME_START = date(1970, 1, 1)
+
+# Re-read stats changed this long before the last sync, so clock skew between app servers never drops an update
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Sync at least this often even if the version did not move, e.g. for a stat changed outside touch_leaderboard
+SYNC_TTL = timedelta(seconds=30)
+
+
+def period_start(period, day):
+    """First UTC day of the daily, weekly (Monday) or all-time window containing day"""
+    if period == 'daily':
+        return day
+    if period == 'weekly':
+        return day - timedelta(days=day.weekday())
+    return ALL_TIME_START
+
+
+def board_key(game_type, game_mode_id, period, day):
+    """Key of a rollup board; game_mode_id None is the board of every game mode"""
+    return f"{game_type}:{game_mode_id or 'any'}:{period}:{period_start(period, day).isoformat()}"
+
+
+def rollup_boards(game_type, game_mode_id, day):
+    """(board, game_mode_id, period, period_start) of every rollup a completion on this day counts for.
+
+    The all-time board of every game mode is user_stats itself, so it has no rollup.
+    """
+    boards = []
+    for mode_id in (game_mode_id, None):
+        for period in PERIODS:
+            if mode_id is None and period == 'all':
+                continue
+            boards.append((board_key(game_type, mode_id, period, day), mode_id, period, period_start(period, day)))
+    return boards
+
+
+def _version_name(game_type):
+    return f'leaderboard:{game_type}'
+
+
+def touch_leaderboard(game_type):
+    """Tell every process that stats of this game type changed; call after a completed game is counted"""
+    bump_version(_version_name(game_type))
+
+
+class Leaderboard:
+    """Players of one board ordered by total score, kept in sync with its source table incrementally.
+
+    Rows are kept in a list sorted by (-total_score, user_id), so the top N is a
+    slice and a player's rank is a binary search. After the initial load only
+    the source rows whose updated_at moved since the last sync are read.
+    """
+
+    def __init__(self, game_type, source, start=ALL_TIME_START):
+        self.game_type = game_type
+        self.source = source
+        self.start = start
+        self.rows = {}
+        self.keys = []
+        self.version = None
+        self.synced_at = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(row):
+        return -row.total_score, row.user_id
+
+    def _apply(self, row):
+        old = self.rows.get(row.user_id)
+        if old is not None:
+            old_key = self._key(old)
+            del self.keys[bisect_left(self.keys, old_key)]
+        self.rows[row.user_id] = row
+        insort(self.keys, self._key(row))
+
+    def _is_fresh(self, version):
+        return (self.synced_at is not None and version == self.version
+                and timezone.now() - self.synced_at < SYNC_TTL)
+
+    def sync(self):
+        """Load the changed rows if some process counted a game since the last sync, or SYNC_TTL passed"""
+        version = read_version(_version_name(self.game_type))
+        if self._is_fresh(version):
+            return
+
+        with self.lock:
+            if self._is_fresh(version):
+                return
+
+            rows = self.source
+            if self.synced_at is not None:
+                rows = rows.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP)
+            synced_at = timezone.now()
+
+            for values in rows.values_list(*ROW_FIELDS):
+                self._apply(LeaderboardRow(*values))
+            self.synced_at = synced_at
+            self.version = version
+
+    def top(self, limit=20):
+        """The first players of the leaderboard, best first"""
+        return [self.rows[user_id] for _score, user_id in self.keys[:limit]]
+
+    def entry(self, user_id):
+        """Leaderboard row of a player, or None if the player has not completed a game"""
+        return self.rows.get(user_id)
+
+    def rank(self, user_id):
+        """1-based rank of a player; players with the same total score share a rank"""
+        row = self.rows.get(user_id)
+        if row is None:
+            return None
+        return bisect_left(self.keys, (-row.total_score,)) + 1
+
+
+_leaderboards = {}
+_leaderboards_lock = threading.Lock()
+
+
+def get_leaderboard(game_type, game_mode=None, period='all', day=None):
+    """Return the shared, up to date leaderboard of a game type, game mode and period"""
+    game_mode_id = game_mode.id if game_mode else None
+    if game_mode_id is None and period == 'all':
+        key = game_type
+    else:
+        day = day or timezone.now().date()
+        key = board_key(game_type, game_mode_id, period, day)
+
+    leaderboard = _leaderboards.get(key)
+    if leaderboard is None:
+        with _leaderboards_lock:
+            leaderboard = _leaderboards.get(key)
+            if leaderboard is None:
+                if key == game_type:
+                    leaderboard = Leaderboard(game_type, UserStat.objects.filter(game_type=game_type))
+                else:
+                    start = period_start(period, day)
+                    leaderboard = Leaderboard(game_type, LeaderboardRollup.objects.filter(board=key), start)
+                    # Daily and weekly boards of past windows are not shown anymore
+                    prefix = f"{game_type}:{game_mode_id or 'any'}:{period}:"
+                    for old_key in [old_key for old_key, old in _leaderboards.items()
+                                    if old_key.startswith(prefix) and old.start < start]:
+                        del _leaderboards[old_key]
+                _leaderboards[key] = leaderboard
+    leaderboard.sync()
+    return leaderboard
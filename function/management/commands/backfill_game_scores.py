@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from frontend.models import Game, GameMode
+from function.scoring import game_score
+
+
+class Command(BaseCommand):
+    help = 'Write games.score for completed games played before the column existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Games updated per UPDATE batch')
+        parser.add_argument('--all', action='store_true', help='Recompute every completed game, not only unscored wins')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        game_modes = {game_mode.id: game_mode for game_mode in GameMode.objects.all()}
+
+        games = Game.objects.filter(is_completed=True)
+        if not options['all']:
+            # Lost games score 0, which is already the column default
+            games = games.filter(is_won=True, score=0)
+
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(
+                games.filter(id__gt=last_id).order_by('id')
+                .only('id', 'game_mode_id', 'attempts_used', 'is_won', 'score')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            changed = []
+            for game in batch:
+                game.game_mode = game_modes[game.game_mode_id]
+                score = game_score(game)
+                if score != game.score:
+                    game.score = score
+                    changed.append(game)
+            Game.objects.bulk_update(changed, ['score'])
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Updated the score of {updated} games'))
@@ -0,0 +1,132 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend.models import GameMode
+from function.candidate_solver import get_candidate_solver
+
+# Set in every worker process by _init_worker so jobs only carry target indices
+_codes = None
+
+
+def _init_worker(codes):
+    global _codes
+    _codes = codes
+
+
+def _best_guess(candidates, guessed):
+    """Greedy optimal guess: the champion whose feedback leaves the fewest expected candidates"""
+    sub = _codes[:, candidates]
+    # Number of candidate pairs that stay indistinguishable after each guess (sum of squared bucket sizes)
+    pairs = (sub[:, :, None] == sub[:, None, :]).sum(axis=(1, 2))
+    is_candidate = np.zeros(len(_codes), dtype=bool)
+    is_candidate[candidates] = True
+    # Prefer guesses that could win on the spot when the split is equally good
+    score = pairs * 2 - is_candidate
+    score[guessed] = np.iinfo(score.dtype).max
+    return int(np.argmin(score))
+
+
+def _play(target, max_attempts, choose):
+    """Play one game against target and return the number of attempts used and whether it was won"""
+    candidates = np.arange(len(_codes))
+    guessed = []
+    for attempt in range(1, max_attempts + 1):
+        guess = choose(candidates, guessed)
+        if guess == target:
+            return attempt, True
+        guessed.append(guess)
+        candidates = candidates[_codes[guess, candidates] == _codes[guess, target]]
+    return max_attempts, False
+
+
+def _simulate(job):
+    """Simulate optimal and random play for a chunk of targets of one game mode"""
+    max_attempts, targets, samples, seed = job
+    rng = np.random.default_rng(seed)
+
+    def random_choice(candidates, guessed):
+        return int(rng.choice(candidates))
+
+    results = []
+    for target in targets:
+        optimal_attempts, optimal_won = _play(target, max_attempts, _best_guess)
+        random_games = [_play(target, max_attempts, random_choice) for _ in range(samples)]
+        attempts = np.array([used for used, _won in random_games])
+        won = np.array([won for _used, won in random_games])
+        results.append({
+            'target': int(target),
+            'optimal_attempts': optimal_attempts,
+            'optimal_won': optimal_won,
+            'random_attempts': float(attempts.mean()),
+            'random_win_rate': float(won.mean()),
+            # 0 = always found on the first guess, 1 = never found
+            'difficulty': float(np.where(won, attempts, max_attempts + 1).mean() / (max_attempts + 1)),
+        })
+    return max_attempts, results
+
+
+class Command(BaseCommand):
+    help = 'Simulate optimal and random play against every target champion to calibrate difficulty'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=50, help='Random games per target champion')
+        parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count)')
+        parser.add_argument('--chunk-size', type=int, default=16, help='Target champions per pool job')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the per-champion results to this JSON file')
+
+    def handle(self, *args, **options):
+        game_modes = list(GameMode.objects.exclude(max_attempts__isnull=True).order_by('-max_attempts'))
+        if not game_modes:
+            raise CommandError('No game modes with max_attempts defined')
+
+        solver = get_candidate_solver()
+        if not len(solver.ids):
+            raise CommandError('No champions available')
+
+        codes = solver.feedback_codes()
+        chunk_size = max(options['chunk_size'], 1)
+        attempts_to_modes = {}
+        jobs = []
+        for game_mode in game_modes:
+            attempts_to_modes.setdefault(game_mode.max_attempts, []).append(game_mode)
+        for max_attempts in attempts_to_modes:
+            for start in range(0, len(solver.ids), chunk_size):
+                targets = list(range(start, min(start + chunk_size, len(solver.ids))))
+                jobs.append((max_attempts, targets, options['samples'], options['seed'] + len(jobs)))
+
+        results = {max_attempts: [] for max_attempts in attempts_to_modes}
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker,
+                                 initargs=(codes,)) as executor:
+            for max_attempts, chunk in executor.map(_simulate, jobs):
+                results[max_attempts].extend(chunk)
+
+        output = {}
+        for max_attempts, modes in attempts_to_modes.items():
+            rows = sorted(results[max_attempts], key=lambda row: row['target'])
+            for row in rows:
+                row['champion_id'] = int(solver.ids[row.pop('target')])
+
+            summary = {
+                'max_attempts': max_attempts,
+                'optimal_expected_attempts': round(float(np.mean([row['optimal_attempts'] for row in rows])), 3),
+                'optimal_win_rate': round(float(np.mean([row['optimal_won'] for row in rows])), 3),
+                'random_expected_attempts': round(float(np.mean([row['random_attempts'] for row in rows])), 3),
+                'random_win_rate': round(float(np.mean([row['random_win_rate'] for row in rows])), 3),
+            }
+            for game_mode in modes:
+                output[game_mode.name] = {'summary': summary, 'champions': rows}
+                self.stdout.write(
+                    f"{game_mode.name} ({max_attempts} attempts): "
+                    f"optimal {summary['optimal_expected_attempts']} attempts / {summary['optimal_win_rate']:.0%} won, "
+                    f"random {summary['random_expected_attempts']} attempts / {summary['random_win_rate']:.0%} won"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                json.dump(output, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {os.path.abspath(options['output'])}"))
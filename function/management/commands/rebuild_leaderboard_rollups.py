@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from frontend.models import Game, LeaderboardRollup
+from function.leaderboard import touch_leaderboard
+from function.user_stats import Completion, record_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily, weekly and per game mode leaderboard rollups from completed games'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Games read per batch')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        games = Game.objects.filter(is_completed=True, user__isnull=False).order_by('id').values_list(
+            'id', 'user_id', 'game_type', 'game_mode_id', 'updated_at', 'created_at', 'is_won', 'score',
+            'attempts_used'
+        )
+
+        game_types = set()
+        counted = 0
+        last_id = 0
+        with transaction.atomic():
+            LeaderboardRollup.objects.all().delete()
+            while True:
+                batch = list(games.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+
+                record_rollups([
+                    Completion(user_id, game_type, game_mode_id, (updated_at or created_at).date(),
+                               is_won, score, attempts_used)
+                    for _id, user_id, game_type, game_mode_id, updated_at, created_at, is_won, score, attempts_used
+                    in batch
+                ])
+                game_types.update(row[2] for row in batch)
+                counted += len(batch)
+
+        for game_type in game_types:
+            touch_leaderboard(game_type)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the leaderboard rollups from {counted} games'))
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from frontend.models import Language
+from function.daily_challenge import warm_daily_challenges
+
+
+class Command(BaseCommand):
+    help = 'Precompute the daily challenge targets of the coming days and warm them into the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='Number of days to warm, starting today (UTC)')
+
+    def handle(self, *args, **options):
+        language_codes = [code for code, _name in settings.LANGUAGES]
+        languages = [None] + list(Language.objects.filter(code__in=language_codes))
+
+        for day, champion_id in warm_daily_challenges(languages, days=options['days']):
+            self.stdout.write(f'{day.isoformat()}: champion {champion_id}')
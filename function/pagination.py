@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor holding the sort key of the last item of a page"""
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Sort key stored in a cursor, or None if the cursor is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, list):
+        return None
+    return tuple(parse_datetime(value['dt']) if isinstance(value, dict) else value for value in payload)
+
+
+def _after(ordering, values):
+    """Q matching the rows that come after values in ordering, e.g. ('-created_at', '-id')"""
+    condition = Q()
+    for position in reversed(range(len(ordering))):
+        field = ordering[position].lstrip('-')
+        lookup = 'lt' if ordering[position].startswith('-') else 'gt'
+        equal = {ordering[earlier].lstrip('-'): values[earlier] for earlier in range(position)}
+        condition |= Q(**equal, **{f'{field}__{lookup}': values[position]})
+    return condition
+
+
+def keyset_page(queryset, ordering, cursor, page_size):
+    """One page of a queryset after the cursor: (items, next_cursor).
+
+    ordering must end with a unique field (usually id) so every row has its own
+    key. The page is read with an index range scan from the cursor instead of
+    OFFSET, one row more than page_size to learn whether more rows follow, so
+    a page is a single query; next_cursor is None on the last page.
+    """
+    values = decode_cursor(cursor)
+    page = queryset.order_by(*ordering)
+    if values is not None and len(values) == len(ordering):
+        page = page.filter(_after(ordering, values))
+
+    items = list(page[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+
+    items = items[:page_size]
+    last = tuple(getattr(items[-1], field.lstrip('-')) for field in ordering)
+    return items, encode_cursor(last)
+
+
+def keyset_slice(items, key, cursor, page_size):
+    """Same cursor scheme over a list already sorted by key in ascending order.
+
+    key must return a JSON-serialisable tuple ending with a unique value.
+    """
+    values = decode_cursor(cursor)
+    start = 0
+    if values is not None:
+        values = list(values)
+        start = len(items)
+        for index, item in enumerate(items):
+            item_key = list(key(item))
+            if item_key > values:
+                start = index
+                break
+
+    page = items[start:start + page_size]
+    if start + page_size >= len(items):
+        return page, None
+    return page, encode_cursor(key(page[-1]))
@@ -0,0 +1,89 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from function.catalog_version import get_catalog_version
+
+# Responses only change when the cron updates the catalog, the version in the key retires them
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Responses and counters stay in each process: a hit must not cost a database round trip,
+# and the shared catalog version still retires every process's entries
+response_cache = caches['local']
+
+# Endpoints wrapped with cached_response, for the stats
+CACHED_ENDPOINTS = []
+
+
+def canonical_params(query_dict, params):
+    """The given GET parameters, stripped, without empty values and sorted, as a query string.
+
+    '?sort_by=name&position=' and '?position=&sort_by=name ' are the same request,
+    and parameters the endpoint does not read (cache busters, tracking) are ignored.
+    """
+    items = []
+    for name in sorted(params):
+        for value in sorted(query_dict.getlist(name)):
+            value = value.strip()
+            if value:
+                items.append((name, value))
+    return urlencode(items)
+
+
+def _count(endpoint, outcome):
+    key = f'lolgame:response_cache:{outcome}:{endpoint}'
+    try:
+        response_cache.incr(key)
+    except ValueError:
+        if not response_cache.add(key, 1, None):
+            response_cache.incr(key)
+
+
+def response_cache_stats():
+    """endpoint -> {'hits', 'misses'} of every cached endpoint in this process"""
+    keys = {
+        (endpoint, outcome): f'lolgame:response_cache:{outcome}:{endpoint}'
+        for endpoint in CACHED_ENDPOINTS for outcome in ('hits', 'misses')
+    }
+    values = response_cache.get_many(list(keys.values()))
+    return {
+        endpoint: {outcome: values.get(keys[(endpoint, outcome)], 0) for outcome in ('hits', 'misses')}
+        for endpoint in CACHED_ENDPOINTS
+    }
+
+
+def cached_response(endpoint, params):
+    """Cache successful GET responses of a catalog endpoint per language, parameters and catalog version.
+
+    params lists the GET parameters the view reads; the response carries
+    X-Cache: HIT or MISS.
+    """
+    CACHED_ENDPOINTS.append(endpoint)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            digest = hashlib.sha1(canonical_params(request.GET, params).encode()).hexdigest()
+            key = f'lolgame:response:{endpoint}:{get_catalog_version()}:{request.LANGUAGE_CODE}:{digest}'
+            cached = response_cache.get(key)
+            if cached is not None:
+                _count(endpoint, 'hits')
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            _count(endpoint, 'misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                response_cache.set(key, (response.content, response['Content-Type']), RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,34 @@
+# Max score of a won game per game mode name, used when the mode has no max_score of its own
+DEFAULT_MAX_SCORES = {
+    'easy': 20,
+    'medium': 28,
+    'hard': 36,
+}
+DEFAULT_MAX_SCORE = 30
+
+
+def max_score(game_mode):
+    """Score of a first-guess win in this game mode, taken from game_modes.max_score when set"""
+    if game_mode.max_score:
+        return game_mode.max_score
+    return DEFAULT_MAX_SCORES.get(game_mode.name.lower(), DEFAULT_MAX_SCORE)
+
+
+def calculate_score(game_mode, attempts_used, is_won=True):
+    """Score of a game based on its game mode and the attempts used; lost games score 0"""
+    if not is_won:
+        return 0
+
+    best_score = max_score(game_mode)
+
+    # Ensure first guess gets full max score
+    if attempts_used <= 1 or not game_mode.max_attempts:
+        return best_score
+
+    remaining_percentage = (game_mode.max_attempts - attempts_used + 1) / game_mode.max_attempts
+    return max(int(best_score * remaining_percentage), 0)
+
+
+def game_score(game):
+    """Score of a completed game, as written to games.score"""
+    return calculate_score(game.game_mode, game.attempts_used, game.is_won)
@@ -0,0 +1,390 @@
+import hashlib
+import json
+import math
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from itertools import groupby
+
+from function.catalog_version import CatalogCache
+from function.champion_matrix import get_champion_matrix
+from function.translation_catalog import get_translation_catalog, language_code
+
+# Letters folded by hand because NFKD does not decompose them
+EXTRA_FOLDS = str.maketrans({'ı': 'i', 'ø': 'o', 'đ': 'd', 'ł': 'l', 'æ': 'ae', 'œ': 'oe', 'ß': 'ss'})
+
+# Ranking of the ways a champion can match, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, TYPO, TRIGRAM = 100, 80, 60, 40, 20, 0
+
+# Typo matches on a title rank below typo matches on a name
+TITLE_PENALTY = 10
+
+SearchBundle = namedtuple('SearchBundle', ('digest', 'content'))
+
+# Minimum trigram similarity for a fuzzy match to be returned
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Longer queries are cut before the typo search, which keeps its cost bounded
+MAX_QUERY_LENGTH = 32
+
+# Title words shorter than this ('the', 'of', ...) are left out of the typo search
+MIN_TITLE_WORD_LENGTH = 4
+
+# Champion text searched by champions_api, with the weight of a match in each field
+TEXT_FIELDS = (('name', 3.0), ('title', 2.0), ('lore', 1.0))
+
+# Most indexed words the last, possibly unfinished word of a text search expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+# Scripts written without spaces between words, indexed as character bigrams
+IDEOGRAPHIC_SCRIPTS = ('CJK', 'HIRAGANA', 'KATAKANA', 'HANGUL')
+
+
+def fold(text):
+    """Lower-case text without accents and punctuation, for matching 'Kai'Sa' with 'kai sa' or 'Şivir' with 'sivir'"""
+    text = unicodedata.normalize('NFKD', (text or '').casefold().translate(EXTRA_FOLDS))
+    folded = []
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        folded.append(char if char.isalnum() else ' ')
+    # Recompose what NFKD split apart without accents, e.g. Hangul syllables
+    return unicodedata.normalize('NFC', ' '.join(''.join(folded).split()))
+
+
+def compact(text):
+    """Folded text without spaces, the way get_champion_id turns "Kai'Sa" into 'kaisa' and "Cho'Gath" into 'chogath'"""
+    return fold(text).replace(' ', '')
+
+
+def typo_tolerance(query):
+    """Edits allowed between a query and a name: none for very short queries, at most two"""
+    if len(query) < 4:
+        return 0
+    return 1 if len(query) < 8 else 2
+
+
+def edit_distance(first, second):
+    """Levenshtein distance between two strings"""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char)
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of terms, finds every term within a few edits of a query.
+
+    Each child hangs off its parent at its edit distance from the parent, so by
+    the triangle inequality a search only descends into children whose distance
+    is within the tolerance of the query's distance to the parent.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, term, value):
+        if self.root is None:
+            self.root = (term, {value}, {})
+            return
+        node = self.root
+        while True:
+            node_term, values, children = node
+            distance = edit_distance(term, node_term)
+            if distance == 0:
+                values.add(value)
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (term, {value}, {})
+                return
+            node = child
+
+    def search(self, query, tolerance):
+        """(distance, values) of every term at most tolerance edits away from the query"""
+        matches = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_term, values, children = stack.pop()
+            distance = edit_distance(query, node_term)
+            if distance <= tolerance:
+                matches.append((distance, values))
+            for child_distance, child in children.items():
+                if distance - tolerance <= child_distance <= distance + tolerance:
+                    stack.append(child)
+        return matches
+
+
+def is_ideographic(char):
+    """Whether a character belongs to Chinese, Japanese or Korean script"""
+    return unicodedata.name(char, '').startswith(IDEOGRAPHIC_SCRIPTS)
+
+
+def tokenize(text, unigrams=False):
+    """Folded words of Latin and Cyrillic text, character bigrams of Chinese, Japanese and Korean text.
+
+    A single ideographic character is its own token; with unigrams every
+    ideographic character is added as well, so one-character queries match.
+    """
+    tokens = []
+    for word in fold(text).split(' '):
+        for ideographic, run in groupby(word, key=is_ideographic):
+            run = ''.join(run)
+            if not ideographic:
+                tokens.append(run)
+                continue
+            if len(run) == 1 or unigrams:
+                tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return [token for token in tokens if token]
+
+
+def trigrams(text):
+    """Character trigrams of a folded term, padded so short terms and word starts count"""
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LanguageSearchIndex:
+    """Search terms of every champion in one language.
+
+    Holds a sorted term list for prefixes, a trigram map for substrings and a
+    BK-tree of compact names, name words and title words for typos.
+    """
+
+    def __init__(self, code, matrix, catalog):
+        self.code = code
+        self.results = {}
+        self.terms = {}
+        self.prefixes = []
+        self.trigram_map = {}
+        self.typo_tree = BKTree()
+
+        for champion_id, row in matrix.rows.items():
+            name = catalog.name('champion', champion_id, code) or row.name
+            position = catalog.name('position', row.position_id, code) if row.position_id else ''
+            self.results[champion_id] = {
+                'id': champion_id,
+                'name': name,
+                'image': row.image_main,
+                'position': position
+            }
+
+            # The localized name first, the English name still finds the champion in every language.
+            # Compact forms let 'kaisa' and 'chogath' match names written with apostrophes or spaces.
+            terms = []
+            for term in (fold(name), fold(row.name), compact(name), compact(row.name)):
+                if term and term not in terms:
+                    terms.append(term)
+            self.terms[champion_id] = terms
+
+            for term in terms:
+                for start in self._word_starts(term):
+                    self.prefixes.append((term[start:], start == 0, champion_id))
+                for trigram in trigrams(term):
+                    self.trigram_map.setdefault(trigram, set()).add(champion_id)
+                self.typo_tree.add(term.replace(' ', ''), (champion_id, False))
+                for word in term.split(' '):
+                    self.typo_tree.add(word, (champion_id, False))
+
+            title = fold(catalog.text('champion', champion_id, 'title', code) or '')
+            if title:
+                self.typo_tree.add(title.replace(' ', ''), (champion_id, True))
+                for word in title.split(' '):
+                    if len(word) >= MIN_TITLE_WORD_LENGTH:
+                        self.typo_tree.add(word, (champion_id, True))
+
+        self.prefixes.sort()
+        self.prefix_keys = [entry[0] for entry in self.prefixes]
+        self.bundle = self._build_bundle()
+
+    def _build_bundle(self):
+        """Every champion's search result as compact JSON, named by the hash of its content"""
+        results = sorted(self.results.values(), key=lambda result: (result['name'], result['id']))
+        content = json.dumps(results, ensure_ascii=False, separators=(',', ':')).encode()
+        return SearchBundle(hashlib.sha256(content).hexdigest()[:16], content)
+
+    @staticmethod
+    def _word_starts(term):
+        start = 0
+        for word in term.split(' '):
+            yield start
+            start += len(word) + 1
+
+    def _prefix_matches(self, query):
+        """champion_id -> PREFIX or WORD_PREFIX for terms (or words of terms) starting with the query"""
+        matches = {}
+        position = bisect_left(self.prefix_keys, query)
+        while position < len(self.prefixes) and self.prefix_keys[position].startswith(query):
+            _suffix, is_term_start, champion_id = self.prefixes[position]
+            rank = PREFIX if is_term_start else WORD_PREFIX
+            if matches.get(champion_id, -1) < rank:
+                matches[champion_id] = rank
+            position += 1
+        return matches
+
+    def search(self, query, limit=10):
+        """Champions matching a query, best match first"""
+        query = fold(query)[:MAX_QUERY_LENGTH].strip()
+        if not query:
+            return []
+
+        scores = {}
+        for champion_id, rank in self._prefix_matches(query).items():
+            scores[champion_id] = rank
+
+        # Typos: 'jinks' still finds Jinx, 'mundp' finds Dr. Mundo
+        tolerance = typo_tolerance(query)
+        if tolerance:
+            for distance, values in self.typo_tree.search(query.replace(' ', ''), tolerance):
+                for champion_id, is_title in values:
+                    rank = TYPO - distance * 5 - (TITLE_PENALTY if is_title else 0)
+                    if scores.get(champion_id, -1) < rank:
+                        scores[champion_id] = rank
+
+        # Trigram candidates cover substrings and near misses
+        query_trigrams = trigrams(query)
+        counts = {}
+        for trigram in query_trigrams:
+            for champion_id in self.trigram_map.get(trigram, ()):
+                counts[champion_id] = counts.get(champion_id, 0) + 1
+
+        for champion_id in counts:
+            best = scores.get(champion_id, -1)
+            for term in self.terms[champion_id]:
+                if term == query:
+                    best = max(best, EXACT)
+                elif query in term:
+                    best = max(best, SUBSTRING)
+                else:
+                    term_trigrams = trigrams(term)
+                    similarity = len(query_trigrams & term_trigrams) / len(query_trigrams | term_trigrams)
+                    if similarity >= MIN_TRIGRAM_SIMILARITY:
+                        best = max(best, TRIGRAM + similarity * 10)
+            if best >= 0:
+                scores[champion_id] = max(scores.get(champion_id, -1), best)
+
+        ranked = sorted(scores, key=lambda champion_id: (
+            -scores[champion_id], len(self.results[champion_id]['name']), self.results[champion_id]['name']
+        ))
+        return [self.results[champion_id] for champion_id in ranked[:limit]]
+
+
+class LanguageTextIndex:
+    """Inverted index of champion names, titles and lore in one language: token -> champion id -> weight"""
+
+    def __init__(self, code, matrix, catalog):
+        self.code = code
+        self.postings = {}
+        self.size = len(matrix.rows)
+
+        for champion_id in matrix.rows:
+            for field, field_weight in TEXT_FIELDS:
+                text = catalog.text('champion', champion_id, field, code) or ''
+                for token, count in Counter(tokenize(text, unigrams=True)).items():
+                    posting = self.postings.setdefault(token, {})
+                    posting[champion_id] = posting.get(champion_id, 0) + field_weight * (1 + math.log(count))
+
+        self.vocabulary = sorted(self.postings)
+
+    def _candidates(self, token, is_last):
+        """Indexed tokens a query token matches; the last word also matches words it starts, as it may be unfinished"""
+        if not is_last or is_ideographic(token[0]):
+            return [token] if token in self.postings else []
+        candidates = []
+        position = bisect_left(self.vocabulary, token)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(token):
+            candidates.append(self.vocabulary[position])
+            if len(candidates) == MAX_PREFIX_EXPANSIONS:
+                break
+            position += 1
+        return candidates
+
+    def search(self, query):
+        """Ids of the champions whose text contains every query token, best match first"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        scores = None
+        for number, token in enumerate(tokens):
+            matches = {}
+            for candidate in self._candidates(token, number == len(tokens) - 1):
+                posting = self.postings[candidate]
+                # Rare tokens say more about a champion than words every lore uses
+                idf = math.log(1 + self.size / len(posting))
+                for champion_id, weight in posting.items():
+                    matches[champion_id] = max(matches.get(champion_id, 0), weight * idf)
+
+            if scores is None:
+                scores = matches
+            else:
+                scores = {champion_id: score + matches[champion_id]
+                          for champion_id, score in scores.items() if champion_id in matches}
+            if not scores:
+                return []
+
+        return sorted(scores or (), key=lambda champion_id: (-scores[champion_id], champion_id))
+
+
+class SearchIndex:
+    """Process-wide champion search indexes of one catalog version, built per language on first use"""
+
+    def __init__(self, version):
+        self.version = version
+        self.languages = {}
+        self.texts = {}
+        self.lock = threading.Lock()
+
+    def _get(self, indexes, index_class, language):
+        code = language_code(language) or ''
+        index = indexes.get(code)
+        if index is None:
+            with self.lock:
+                index = indexes.get(code)
+                if index is None:
+                    index = index_class(code, get_champion_matrix(), get_translation_catalog())
+                    indexes[code] = index
+        return index
+
+    def language(self, language):
+        """Autocomplete index of a language"""
+        return self._get(self.languages, LanguageSearchIndex, language)
+
+    def text(self, language):
+        """Name, title and lore index of a language"""
+        return self._get(self.texts, LanguageTextIndex, language)
+
+    def search(self, query, language=None, limit=10):
+        return self.language(language).search(query, limit)
+
+    def bundle(self, language=None):
+        """SearchBundle of a language; its digest changes whenever a name, image or position changes"""
+        return self.language(language).bundle
+
+    def search_text(self, query, language=None):
+        """Ids of the champions whose name, title or lore match a query, best match first"""
+        return self.text(language).search(query)
+
+
+_search_index = CatalogCache(SearchIndex)
+
+
+def get_search_index():
+    """Return the shared search index of the current catalog version"""
+    return _search_index.get()
+
+
+def warm_search_index(language_codes):
+    """Build the search index of every language up front, e.g. right after a champion update"""
+    search_index = get_search_index()
+    for code in language_codes:
+        search_index.language(code)
+        search_index.text(code)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+
+def delete_expired_cache_entries(alias='default'):
+    """Delete the expired rows of a database cache and return how many were deleted.
+
+    The shared cache is configured never to cull, so expired rows stay in the
+    table until this runs.
+    """
+    table = connection.ops.quote_name(settings.CACHES[alias]['LOCATION'])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {connection.ops.quote_name("expires")} < %s',
+            [connection.ops.adapt_datetimefield_value(timezone.now())]
+        )
+        return cursor.rowcount
@@ -0,0 +1,124 @@
+import json
+import random
+from collections import namedtuple
+
+from django.conf import settings
+
+from frontend.models import Ability
+from function.catalog_version import CatalogCache
+from function.champion_matrix import get_champion_matrix
+
+AbilityRow = namedtuple('AbilityRow', ('id', 'champion_id', 'ability_key', 'image_url'))
+
+# Weight floor so weighted sampling never makes a champion unreachable
+MIN_TARGET_WEIGHT = 0.05
+
+# Rejection sampling attempts before the no-repeat rule is dropped
+MAX_SAMPLE_TRIES = 32
+
+
+def load_difficulty_weights(champion_ids):
+    """Per game mode target weights from the calibrate_difficulty output, if configured.
+
+    Easy games favour champions that are easy to find, Hard games favour the hard
+    ones, any other mode stays uniform.
+    """
+    path = getattr(settings, 'CHAMPION_DIFFICULTY_FILE', None)
+    if not path:
+        return {}
+
+    try:
+        with open(path, encoding='utf-8') as calibration_file:
+            calibration = json.load(calibration_file)
+    except (OSError, ValueError):
+        return {}
+
+    weights = {}
+    for mode_name, mode_data in calibration.items():
+        scores = {row['champion_id']: row['difficulty'] for row in mode_data.get('champions', [])}
+        if mode_name.lower() == 'easy':
+            mode_weights = [1 - scores.get(champion_id, 0.5) for champion_id in champion_ids]
+        elif mode_name.lower() == 'hard':
+            mode_weights = [scores.get(champion_id, 0.5) for champion_id in champion_ids]
+        else:
+            continue
+
+        cumulative = []
+        total = 0
+        for weight in mode_weights:
+            total += max(weight, MIN_TARGET_WEIGHT)
+            cumulative.append(total)
+        weights[mode_name.lower()] = cumulative
+    return weights
+
+
+class TargetSampler:
+    """Cached id arrays for picking game targets without scanning the champion or ability tables"""
+
+    def __init__(self, matrix):
+        self.version = matrix.version
+        self.champion_ids = sorted(matrix.rows)
+        self.abilities = [
+            AbilityRow(*row)
+            for row in Ability.objects.order_by('id').values_list('id', 'champion_id', 'ability_key', 'image_url')
+        ]
+        self.ability_ids = [ability.id for ability in self.abilities]
+        self.abilities_by_id = {ability.id: ability for ability in self.abilities}
+        self.abilities_by_champion = {}
+        for ability in self.abilities:
+            self.abilities_by_champion.setdefault(ability.champion_id, []).append(ability)
+        self.champions_with_abilities = sorted(
+            champion_id for champion_id in self.abilities_by_champion if champion_id in matrix.rows
+        )
+        self.difficulty_weights = load_difficulty_weights(self.champion_ids)
+
+    @staticmethod
+    def _sample(population, exclude, cum_weights=None):
+        if not population:
+            return None
+        for _ in range(MAX_SAMPLE_TRIES):
+            if cum_weights:
+                choice = random.choices(population, cum_weights=cum_weights)[0]
+            else:
+                choice = random.choice(population)
+            if choice not in exclude:
+                return choice
+        return choice
+
+    def champion(self, exclude=(), game_mode=None):
+        """Random champion id, weighted by calibrated difficulty when the game mode has weights"""
+        cum_weights = self.difficulty_weights.get(game_mode.name.lower()) if game_mode else None
+        return self._sample(self.champion_ids, set(exclude), cum_weights)
+
+    def ability(self, exclude=()):
+        """Random ability row out of every ability; exclude holds ability ids"""
+        ability_id = self._sample(self.ability_ids, set(exclude))
+        return self.abilities_by_id.get(ability_id)
+
+    def champion_and_ability(self, exclude=()):
+        """Random champion that has abilities, and one of its abilities"""
+        champion_id = self._sample(self.champions_with_abilities, set(exclude))
+        if champion_id is None:
+            return None, None
+        return champion_id, random.choice(self.abilities_by_champion[champion_id])
+
+
+_sampler = CatalogCache(lambda version: TargetSampler(get_champion_matrix()))
+
+
+def get_target_sampler():
+    """Return the shared sampler, rebuilt along with the champion matrix"""
+    return _sampler.get()
+
+
+def recent_targets(session, game_type):
+    """Targets this player saw most recently for a game type"""
+    return session.get(f'recent_{game_type}_targets', [])
+
+
+def remember_target(session, game_type, target_id):
+    """Remember a new target so the next TARGET_HISTORY_SIZE games do not repeat it"""
+    history_size = getattr(settings, 'TARGET_HISTORY_SIZE', 10)
+    recent = [target_id] + [recent_id for recent_id in recent_targets(session, game_type) if recent_id != target_id]
+    session[f'recent_{game_type}_targets'] = recent[:history_size]
+    session.modified = True
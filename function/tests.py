@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from frontend.models import Champion, Game, GameMode, Guess
+from function.catalog_version import bump_catalog_version
+from function.champion_matrix import get_champion_matrix
+from function.guess_engine import GuessError, submit_champion_guess
+
+
+class SubmitChampionGuessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.game_mode = GameMode.objects.create(name='Medium', max_attempts=8)
+        cls.target = Champion.objects.create(name='Ahri', slug='ahri')
+        cls.other = Champion.objects.create(name='Garen', slug='garen')
+
+    def setUp(self):
+        self.game = Game.objects.create(game_mode=self.game_mode, game_type='champion', target_champion=self.target)
+        # Build the champion matrix of this data outside the captured queries
+        bump_catalog_version()
+        get_champion_matrix()
+
+    def statements(self, queries):
+        """The kind of every captured statement, e.g. 'SELECT', 'INSERT', 'SAVEPOINT'"""
+        kinds = []
+        for query in queries.captured_queries:
+            sql = query['sql'].upper()
+            if sql.startswith('ROLLBACK TO SAVEPOINT'):
+                kinds.append('ROLLBACK TO SAVEPOINT')
+            elif sql.startswith('RELEASE SAVEPOINT'):
+                kinds.append('RELEASE SAVEPOINT')
+            else:
+                kinds.append(sql.split()[0])
+        return kinds
+
+    def test_wrong_guess_query_sequence(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = submit_champion_guess(self.game.id, self.other.id)
+
+        self.assertFalse(result.is_correct)
+        self.assertFalse(result.game_completed)
+        # TestCase wraps each test in a transaction, so the outer atomic block is a savepoint too
+        self.assertEqual(self.statements(queries), [
+            'SAVEPOINT', 'SELECT', 'SAVEPOINT', 'INSERT', 'RELEASE SAVEPOINT', 'UPDATE', 'RELEASE SAVEPOINT',
+        ])
+        select = queries.captured_queries[1]['sql']
+        if connection.features.has_select_for_update:
+            self.assertIn('FOR UPDATE', select.upper())
+        self.assertIn('game_modes', select)
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 1)
+        self.assertEqual(Guess.objects.filter(game=self.game).count(), 1)
+
+    def test_correct_guess_completes_game(self):
+        result = submit_champion_guess(self.game.id, self.target.id)
+
+        self.assertTrue(result.is_correct)
+        self.assertTrue(result.game_completed)
+        self.game.refresh_from_db()
+        self.assertTrue(self.game.is_completed)
+        self.assertTrue(self.game.is_won)
+        self.assertEqual(self.game.score, result.score)
+
+    def test_duplicate_guess_rejected_by_unique_key(self):
+        submit_champion_guess(self.game.id, self.other.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaises(GuessError) as error:
+                submit_champion_guess(self.game.id, self.other.id)
+
+        self.assertEqual(error.exception.status, 400)
+        # The INSERT hits the (game, champion) key and only its savepoint is rolled back
+        kinds = self.statements(queries)
+        self.assertIn('INSERT', kinds)
+        self.assertIn('ROLLBACK TO SAVEPOINT', kinds)
+        self.assertNotIn('UPDATE', kinds)
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 1)
+        self.assertEqual(Guess.objects.filter(game=self.game).count(), 1)
+
+    def test_missing_game(self):
+        with self.assertRaises(GuessError) as error:
+            submit_champion_guess(0, self.other.id)
+        self.assertEqual(error.exception.status, 404)
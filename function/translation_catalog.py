@@ -0,0 +1,105 @@
+import threading
+
+from frontend.models import Champion, ChampionTranslation, Position, PositionTranslation, Region, RegionTranslation, \
+    Species, SpeciesTranslation, Resource, ResourceTranslation, CombatRange, CombatRangeTranslation, Gender, \
+    GenderTranslation, Ability, AbilityTranslation, ChampionSkin, ChampionSkinTranslation
+from function.catalog_version import CatalogCache
+
+# kind -> (base model holding the English data, translation model, foreign key on the translation, fields)
+TRANSLATION_KINDS = {
+    'champion': (Champion, ChampionTranslation, 'champion', ('name', 'title', 'lore', 'meta_description')),
+    'position': (Position, PositionTranslation, 'position', ('name',)),
+    'region': (Region, RegionTranslation, 'region', ('name', 'description')),
+    'species': (Species, SpeciesTranslation, 'species', ('name',)),
+    'resource': (Resource, ResourceTranslation, 'resource', ('name',)),
+    'combat_range': (CombatRange, CombatRangeTranslation, 'combat_range', ('name',)),
+    'gender': (Gender, GenderTranslation, 'gender', ('name',)),
+    'ability': (Ability, AbilityTranslation, 'ability', ('name', 'description')),
+    'skin': (ChampionSkin, ChampionSkinTranslation, 'skin', ('name',)),
+}
+
+
+def language_code(language):
+    """Accept a Language instance, a language code or None"""
+    if language is None:
+        return None
+    return getattr(language, 'code', language)
+
+
+class TranslationCatalog:
+    """All translations of one catalog version, loaded in bulk per language on first use"""
+
+    def __init__(self, version):
+        self.version = version
+        self._base = None
+        self._languages = {}
+        self._lock = threading.Lock()
+
+    def _load_base(self):
+        base = {}
+        for kind, (base_model, _translation_model, _fk, fields) in TRANSLATION_KINDS.items():
+            base[kind] = {row[0]: row[1:] for row in base_model.objects.values_list('id', *fields)}
+        return base
+
+    def _load_language(self, code):
+        translations = {}
+        for kind, (_base_model, translation_model, fk, fields) in TRANSLATION_KINDS.items():
+            translations[kind] = {
+                row[0]: row[1:]
+                for row in translation_model.objects.filter(language__code=code).values_list(f'{fk}_id', *fields)
+            }
+        return translations
+
+    def base(self):
+        if self._base is None:
+            with self._lock:
+                if self._base is None:
+                    self._base = self._load_base()
+        return self._base
+
+    def language(self, language):
+        code = language_code(language)
+        if not code:
+            return None
+        translations = self._languages.get(code)
+        if translations is None:
+            with self._lock:
+                translations = self._languages.get(code)
+                if translations is None:
+                    translations = self._load_language(code)
+                    self._languages[code] = translations
+        return translations
+
+    def text(self, kind, object_id, field, language=None):
+        """Translated field value, falling back to the English base data"""
+        index = TRANSLATION_KINDS[kind][3].index(field)
+        translations = self.language(language)
+        if translations:
+            row = translations[kind].get(object_id)
+            if row and row[index]:
+                return row[index]
+        row = self.base()[kind].get(object_id)
+        return row[index] if row else None
+
+    def name(self, kind, object_id, language=None):
+        return self.text(kind, object_id, 'name', language) or ''
+
+    def options(self, kind, language=None):
+        """All values of a kind as [{'id', 'name'}] in id order, for filter dropdowns"""
+        return [
+            {'id': object_id, 'name': self.name(kind, object_id, language)}
+            for object_id in sorted(self.base()[kind])
+        ]
+
+
+_catalog = CatalogCache(TranslationCatalog)
+
+
+def get_translation_catalog():
+    """Return the shared translation catalog of the current catalog version"""
+    return _catalog.get()
+
+
+def name(kind, object_id, language=None):
+    """Translated name of a catalog object, e.g. name('position', 3, 'tr')"""
+    return get_translation_catalog().name(kind, object_id, language)
@@ -0,0 +1,110 @@
+from collections import namedtuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
+
+from frontend.models import LeaderboardRollup, UserStat
+from function.leaderboard import rollup_boards, touch_leaderboard
+
+Completion = namedtuple('Completion', (
+    'user_id', 'game_type', 'game_mode_id', 'day', 'is_won', 'score', 'attempts_used'
+))
+
+
+def completion_of(user_id, game, day=None):
+    """Completion record of a finished game, counted for the given user on the given UTC day (default today)"""
+    return Completion(
+        user_id, game.game_type, game.game_mode_id, day or timezone.now().date(),
+        game.is_won, game.score, game.attempts_used
+    )
+
+
+def _add(totals, key, completion):
+    games, won, score, best, attempts = totals.get(key, (0, 0, 0, 0, 0))
+    totals[key] = (
+        games + 1,
+        won + (1 if completion.is_won else 0),
+        score + (completion.score if completion.is_won else 0),
+        max(best, completion.score if completion.is_won else 0),
+        attempts + completion.attempts_used,
+    )
+
+
+def _increment(rows, games, won, score, best, attempts):
+    """One UPDATE of a stats row; returns the number of rows changed (0 if the row does not exist)"""
+    return rows.update(
+        # MySQL evaluates SET assignments left to right and later ones see the new values,
+        # so the running average has to be computed before games_played changes
+        average_attempts=(
+            Cast(F('average_attempts'), FloatField()) * F('games_played') + attempts
+        ) / (F('games_played') + games),
+        games_played=F('games_played') + games,
+        games_won=F('games_won') + won,
+        total_score=F('total_score') + score,
+        best_score=Greatest(F('best_score'), best),
+        # update() skips auto_now, the leaderboard sync relies on this column
+        updated_at=timezone.now(),
+    )
+
+
+def _upsert(model, lookup, defaults, totals):
+    """Add totals to the row matching lookup, inserting it if needed; a concurrent insert is retried as UPDATE"""
+    games, won, score, best, attempts = totals
+    if _increment(model.objects.filter(**lookup), *totals):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(
+                games_played=games,
+                games_won=won,
+                total_score=score,
+                best_score=best,
+                average_attempts=attempts / games,
+                **lookup,
+                **defaults
+            )
+    except IntegrityError:
+        _increment(model.objects.filter(**lookup), *totals)
+
+
+def record_rollups(completions):
+    """Add completed games to the daily, weekly and per game mode leaderboard rollups"""
+    rollups = {}
+    for completion in completions:
+        for board, game_mode_id, period, start in rollup_boards(
+                completion.game_type, completion.game_mode_id, completion.day):
+            _add(rollups, (completion.user_id, board, completion.game_type, game_mode_id, period, start), completion)
+
+    for (user_id, board, game_type, game_mode_id, period, start), totals in rollups.items():
+        _upsert(LeaderboardRollup, {'user_id': user_id, 'board': board}, {
+            'game_type': game_type,
+            'game_mode_id': game_mode_id,
+            'period': period,
+            'period_start': start,
+        }, totals)
+
+
+def record_completions(completions):
+    """Count completed games in user_stats and the leaderboard rollups with atomic UPDATEs.
+
+    Completions of the same player are coalesced first, so a burst of finished
+    games costs one statement per player and row instead of a read-modify-write
+    each.
+    """
+    stats = {}
+    for completion in completions:
+        _add(stats, (completion.user_id, completion.game_type), completion)
+
+    for (user_id, game_type), totals in stats.items():
+        _upsert(UserStat, {'user_id': user_id, 'game_type': game_type}, {}, totals)
+    record_rollups(completions)
+
+    for game_type in {game_type for _user_id, game_type in stats}:
+        touch_leaderboard(game_type)
+
+
+def record_completion(user_id, game):
+    """Count one completed game for a user"""
+    record_completions([completion_of(user_id, game)])
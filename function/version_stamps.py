@@ -0,0 +1,29 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from frontend.models import VersionStamp
+
+
+def read_version(name):
+    """Current version of a stamp; a stamp nobody bumped yet is version 1"""
+    version = VersionStamp.objects.filter(name=name).values_list('version', flat=True).first()
+    return 1 if version is None else version
+
+
+def bump_version(name):
+    """Increment a stamp and return its new version.
+
+    The increment is a single UPDATE ... SET version = version + 1, so
+    concurrent bumps from different processes are never lost.
+    """
+    with transaction.atomic():
+        if VersionStamp.objects.filter(name=name).update(version=F('version') + 1):
+            return VersionStamp.objects.filter(name=name).values_list('version', flat=True).get()
+        try:
+            with transaction.atomic():
+                VersionStamp.objects.create(name=name, version=2)
+            return 2
+        except IntegrityError:
+            # Another process created the stamp in between
+            VersionStamp.objects.filter(name=name).update(version=F('version') + 1)
+            return VersionStamp.objects.filter(name=name).values_list('version', flat=True).get()
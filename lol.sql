@@ -6328,4 +6328,103 @@ INSERT INTO champion_translations (champion_id, language_id, name, title) VALUES
 (167, '13', '직스', '폭발물 전문가'),
 (168, '13', '질리언', '시간의 수호자'),
 (169, '13', '조이', '황혼의 화신'),
-(170, '13', '자이라', '가시의 부활');
\ No newline at end of file
+(170, '13', '자이라', '가시의 부활');
+-- Günlük meydan okuma oyun tipi
+ALTER TABLE games MODIFY game_type ENUM('champion', 'ability', 'item', 'daily');
+-- Aynı oyunda aynı şampiyon iki kez tahmin edilemez (eşzamanlı isteklerde de)
+ALTER TABLE guesses ADD UNIQUE KEY unique_game_champion (game_id, champion_id);
+-- Oyun modu başına maksimum puan ve tamamlanan oyunun kayıtlı puanı
+ALTER TABLE game_modes ADD COLUMN max_score INT;
+UPDATE game_modes SET max_score = 20 WHERE LOWER(name) = 'easy';
+UPDATE game_modes SET max_score = 28 WHERE LOWER(name) = 'medium';
+UPDATE game_modes SET max_score = 36 WHERE LOWER(name) = 'hard';
+ALTER TABLE games ADD COLUMN score INT NOT NULL DEFAULT 0 AFTER is_grey_mode;
+-- Liderlik tablosunun artımlı senkronizasyonu için son güncelleme zamanı
+ALTER TABLE user_stats ADD COLUMN updated_at DATETIME NULL;
+CREATE INDEX user_stats_type_updated_idx ON user_stats (game_type, updated_at);
+-- Kullanıcı ve oyun tipi başına tek istatistik satırı (eşzamanlı ilk oyunlar çift satır oluşturmasın)
+ALTER TABLE user_stats ADD UNIQUE KEY unique_user_game_type (user_id, game_type);
+-- Zorluk ve zaman aralığı bazlı liderlik tabloları (günlük, haftalık, tüm zamanlar)
+CREATE TABLE leaderboard_rollups (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    board VARCHAR(100) NOT NULL,        -- 'champion:2:weekly:2026-10-12'
+    user_id INT NOT NULL,
+    game_type VARCHAR(50) NOT NULL,
+    game_mode_id INT,                   -- NULL = tüm modlar
+    period VARCHAR(10) NOT NULL,        -- 'daily', 'weekly', 'all'
+    period_start DATE NOT NULL,
+    games_played INT DEFAULT 0,
+    games_won INT DEFAULT 0,
+    average_attempts FLOAT DEFAULT 0,
+    total_score INT DEFAULT 0,
+    best_score INT DEFAULT 0,
+    updated_at DATETIME NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (game_mode_id) REFERENCES game_modes(id) ON DELETE CASCADE,
+    UNIQUE KEY (board, user_id),
+    INDEX lb_rollups_board_updated_idx (board, updated_at)
+) ENGINE=InnoDB;
+-- Şampiyon analitiği: hedef olma sayısı, kazanma oranı, ortalama deneme ve yanlış tahminler
+CREATE INDEX games_completed_updated_idx ON games (is_completed, updated_at);
+
+CREATE TABLE champion_stats (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    champion_id INT NOT NULL,
+    game_mode_id INT NOT NULL,
+    times_targeted INT DEFAULT 0,
+    games_won INT DEFAULT 0,
+    total_attempts INT DEFAULT 0,
+    updated_at DATETIME NULL,
+    FOREIGN KEY (champion_id) REFERENCES champions(id) ON DELETE CASCADE,
+    FOREIGN KEY (game_mode_id) REFERENCES game_modes(id) ON DELETE CASCADE,
+    UNIQUE KEY (champion_id, game_mode_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE champion_confusions (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    target_champion_id INT NOT NULL,
+    guessed_champion_id INT NOT NULL,
+    game_mode_id INT NOT NULL,
+    times_guessed INT DEFAULT 0,
+    FOREIGN KEY (target_champion_id) REFERENCES champions(id) ON DELETE CASCADE,
+    FOREIGN KEY (guessed_champion_id) REFERENCES champions(id) ON DELETE CASCADE,
+    FOREIGN KEY (game_mode_id) REFERENCES game_modes(id) ON DELETE CASCADE,
+    UNIQUE KEY (target_champion_id, guessed_champion_id, game_mode_id)
+) ENGINE=InnoDB;
+
+-- Toplama işlerinin kaldığı yer
+CREATE TABLE rollup_watermarks (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE,
+    last_updated_at DATETIME NULL,
+    last_id INT DEFAULT 0
+) ENGINE=InnoDB;
+-- Oyun geçmişi için imleç tabanlı sayfalama indeksi
+CREATE INDEX games_user_history_idx ON games (user_id, game_type, is_completed, created_at);
+-- Yetenek oyununda verilen ipuçlarının sırası
+ALTER TABLE games ADD COLUMN clues JSON NULL AFTER score;
+-- Tüm işlemlerin paylaştığı önbellek tablosu (python manage.py createcachetable ile aynı)
+CREATE TABLE django_cache (
+    cache_key VARCHAR(255) NOT NULL PRIMARY KEY,
+    value LONGTEXT NOT NULL,
+    expires DATETIME(6) NOT NULL
+) ENGINE=InnoDB;
+CREATE INDEX django_cache_expires ON django_cache (expires);
+-- İşlemlerin paylaşılan verinin değiştiğini anladığı sürüm sayaçları (katalog, liderlik tabloları)
+CREATE TABLE version_stamps (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    version BIGINT NOT NULL DEFAULT 1
+) ENGINE=InnoDB;
+-- Oyun jetonunun her adımı bir kez ilerleyebilir (tekrar oynatmaya karşı)
+CREATE TABLE game_token_claims (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    nonce VARCHAR(16) NOT NULL,
+    step SMALLINT NOT NULL,
+    created_at DATETIME NOT NULL,
+    UNIQUE KEY (nonce, step)
+) ENGINE=InnoDB;
+CREATE INDEX game_token_claims_created_idx ON game_token_claims (created_at);
+-- Günlük oyunun ait olduğu UTC günü: oyuncu başına günde tek günlük oyun
+ALTER TABLE games ADD COLUMN daily_date DATE NULL AFTER clues;
+ALTER TABLE games ADD UNIQUE KEY games_user_daily_date_uniq (user_id, daily_date);
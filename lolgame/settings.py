@@ -102,6 +102,30 @@ DATABASES = {
     }
 
 
+# Cache
+# The default cache is shared by every worker process and holds the pinned daily targets.
+# Create its table once with "python manage.py createcachetable".
+# Django culls a database cache past MAX_ENTRIES by deleting the lowest keys, which would
+# drop live daily targets, so the limit is set far above what is ever stored and expired
+# rows are deleted by the cron/expire-cache/ job instead.
+# Version stamps live in the version_stamps table, where increments are atomic.
+# The local cache holds per-process data that is cheap to rebuild, e.g. API responses.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000000,
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lolgame-local',
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -200,4 +224,14 @@ LANGUAGE_COOKIE_SAMESITE = 'Lax'
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
\ No newline at end of file
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+# Game target selection
+# Number of recent targets per player that a new game will not repeat
+TARGET_HISTORY_SIZE = 10
+# Output of `manage.py calibrate_difficulty --output ...`; enables difficulty weighted targets when present
+CHAMPION_DIFFICULTY_FILE = BASE_DIR / 'champion_difficulty.json'
+
+# Stateless games: in-progress champion games live in a signed token held by the client and
+# only completed games are written to the database. Clients can also opt in per game.
+STATELESS_GAMES = False
+GAME_TOKEN_MAX_AGE = 24 * 60 * 60
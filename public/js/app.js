@@ -179,3 +179,61 @@ function showNotification(message) {
         notification.classList.add('hidden');
     });
 }
+
+// Champion search bundle of the game pages, see function/search_index.py on the server
+
+// Letters NFKD does not split into a base letter and an accent, folded like the server's EXTRA_FOLDS
+const EXTRA_FOLDS = { 'ı': 'i', 'ø': 'o', 'đ': 'd', 'ł': 'l', 'æ': 'ae', 'œ': 'oe', 'ß': 'ss' };
+
+// Same as the server's fold(): lower case, no accents, punctuation as single spaces
+function foldText(text) {
+    return (text || '').toLowerCase().replace(/[ıøđłæœß]/g, char => EXTRA_FOLDS[char])
+        .normalize('NFKD').replace(/\p{Mn}/gu, '').replace(/[^\p{L}\p{N}]+/gu, ' ').trim()
+        .normalize('NFC');
+}
+
+// Load the localized champion names once; resolves to null if there is no bundle
+async function loadSearchBundle(url) {
+    if (!url) {
+        return null;
+    }
+    try {
+        const response = await fetch(url);
+        const champions = await response.json();
+        return champions.map(champion => {
+            const folded = foldText(champion.name);
+            return { champion: champion, folded: folded, compact: folded.replace(/ /g, '') };
+        });
+    } catch (error) {
+        console.error('Error loading champion search bundle:', error);
+        return null;
+    }
+}
+
+// Exact, prefix, word prefix and substring matches on the localized names, best first
+function searchBundleChampions(bundle, query) {
+    const folded = foldText(query);
+    const compact = folded.replace(/ /g, '');
+    const matches = [];
+
+    bundle.forEach(entry => {
+        let rank = -1;
+        if (entry.folded === folded || entry.compact === compact) {
+            rank = 3;
+        } else if (entry.folded.startsWith(folded) || entry.compact.startsWith(compact)) {
+            rank = 2;
+        } else if (entry.folded.split(' ').some(word => word.startsWith(folded))) {
+            rank = 1;
+        } else if (compact && entry.compact.includes(compact)) {
+            rank = 0;
+        }
+        if (rank >= 0) {
+            matches.push({ rank: rank, champion: entry.champion });
+        }
+    });
+
+    matches.sort((a, b) => b.rank - a.rank
+        || a.champion.name.length - b.champion.name.length
+        || a.champion.name.localeCompare(b.champion.name));
+    return matches.slice(0, 10).map(match => match.champion);
+}